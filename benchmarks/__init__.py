@@ -0,0 +1 @@
+"""Benchmarks for the surf_forecast integration."""
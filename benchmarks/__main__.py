@@ -0,0 +1,108 @@
+"""
+Run the benchmark suites and emit the results as JSON.
+
+    python -m benchmarks [--suite decode] [--output results.json]
+                         [--compare baseline.json] [--threshold 0.1]
+
+Every record is identified by its name and parameters, so the output of two
+commits can be compared. With --compare, records whose wall time grew by more
+than the threshold are listed under "regressions" and the exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from .harness import result_key
+
+SUITES = {
+    "decode": "benchmarks.bench_decode",
+    "entities": "benchmarks.bench_entities",
+    "memory": "benchmarks.bench_memory",
+    "windows": "benchmarks.bench_windows",
+}
+
+
+def _git_revision() -> str | None:
+    """Return the commit the benchmarks run on, if known."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the records whose wall time changed by more than the threshold."""
+    previous = {result_key(record): record for record in baseline}
+    comparison: dict[str, list[dict[str, Any]]] = {
+        "regressions": [],
+        "improvements": [],
+    }
+    for record in results:
+        before = previous.get(result_key(record), {}).get("wall_us")
+        if not before or "wall_us" not in record:
+            continue
+        change = record["wall_us"] / before - 1
+        entry = {
+            "key": result_key(record),
+            "before_us": before,
+            "after_us": record["wall_us"],
+            "change": round(change, 3),
+        }
+        if change > threshold:
+            comparison["regressions"].append(entry)
+        elif change < -threshold:
+            comparison["improvements"].append(entry)
+    return comparison
+
+
+def main() -> int:
+    """Run the selected suites and write the report."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES))
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = []
+    for suite in args.suite or SUITES:
+        results.extend(importlib.import_module(SUITES[suite]).run())
+    report: dict[str, Any] = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        report["comparison"] = compare(results, baseline["results"], args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)  # noqa: T201
+    return 1 if report.get("comparison", {}).get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
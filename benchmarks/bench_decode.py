@@ -0,0 +1,54 @@
+"""
+Compare decoding a ratings response body into a forecast timeline.
+
+The baseline is the previous path: a full JSON decode of the body followed by
+ForecastTimeline.from_payload. The lean path is ForecastTimeline.from_bytes.
+
+Run from the repository root with `python -m benchmarks.bench_decode`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from custom_components.surf_forecast.models import ForecastTimeline
+
+from .harness import HORIZONS, INTERVALS, measure, measure_peak, result
+from .payloads import ratings_body
+
+
+def _full_decode(raw: bytes) -> ForecastTimeline:
+    """Decode the way the coordinator used to: json then from_payload."""
+    return ForecastTimeline.from_payload(json.loads(raw))
+
+
+def run() -> list[dict[str, Any]]:
+    """Run the decode benchmark for every horizon and slot interval."""
+    results = []
+    for days in HORIZONS:
+        for interval_hours in INTERVALS:
+            raw = ratings_body(days=days, interval_hours=interval_hours)
+            assert _full_decode(raw) == ForecastTimeline.from_bytes(raw)  # noqa: S101
+            params = {
+                "days": days,
+                "interval_hours": interval_hours,
+                "body_bytes": len(raw),
+            }
+            for name, decode in (
+                ("decode.full", _full_decode),
+                ("decode.lean", ForecastTimeline.from_bytes),
+            ):
+                results.append(
+                    result(
+                        name,
+                        params,
+                        **measure(lambda decode=decode, raw=raw: decode(raw)),
+                        **measure_peak(lambda decode=decode, raw=raw: decode(raw)),
+                    )
+                )
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
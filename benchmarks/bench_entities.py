@@ -0,0 +1,290 @@
+"""
+Benchmark the coordinator update and entity state paths of surf spots.
+
+A real HomeAssistant instance hosts one coordinator and its three entities per
+spot. The hub is replaced by one serving a synthetic ratings body, so a refresh
+costs the decode and the coordinator bookkeeping but no network I/O. A state
+write is the entity computing its state and attributes followed by
+hass.states.async_set, which is what an update costs on the state machine.
+
+Needs Home Assistant installed (scripts/setup). Run from the repository root
+with `python -m benchmarks.bench_entities`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from custom_components.surf_forecast.binary_sensor import (
+    SurflineConditionBinarySensor,
+)
+from custom_components.surf_forecast.const import (
+    CONF_FORECAST_ATTRIBUTES,
+    DOMAIN,
+    FORECAST_ATTRIBUTES_MODES,
+)
+from custom_components.surf_forecast.coordinator import (
+    SurfForecastDataUpdateCoordinator,
+)
+from custom_components.surf_forecast.models import ForecastTimeline
+from custom_components.surf_forecast.sensor import (
+    SurflineFirstMetConditionSensor,
+    SurflineRatingSensor,
+)
+
+from .harness import (
+    HORIZONS,
+    INTERVALS,
+    REPEAT,
+    SPOT_COUNTS,
+    measure,
+    measure_peak,
+    result,
+)
+from .payloads import ratings_body
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import Entity
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _NullSnapshots:
+    """Snapshot store that keeps nothing."""
+
+    def async_save(self, *_: Any, **__: Any) -> None:
+        """Drop the snapshot."""
+
+
+class _NullArchive:
+    """Forecast archive that keeps nothing."""
+
+    def async_add(self, *_: Any) -> None:
+        """Drop the snapshot."""
+
+
+class _BenchHub:
+    """Hub serving a fixed ratings body to every coordinator."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize with the body every fetch decodes."""
+        self.body = body
+        self.snapshots = _NullSnapshots()
+        self.archive = _NullArchive()
+
+    async def async_fetch_forecast(
+        self,
+        spot_id: str,  # noqa: ARG002
+        **_: Any,
+    ) -> ForecastTimeline:
+        """Decode the body as the API client does after a request."""
+        return ForecastTimeline.from_bytes(self.body)
+
+    def conditions(self, spot_id: str, **_: Any) -> dict[str, Any]:  # noqa: ARG002
+        """Return no conditions, only the ratings are benchmarked."""
+        return {}
+
+
+class _Spot:
+    """A coordinator and its entities, as set up for one config entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, hub: _BenchHub, index: int, mode: str
+    ) -> None:
+        """Create the config entry, coordinator and entities of a spot."""
+        self.entry = ConfigEntry(
+            data={"spot_id": f"spot{index}", "href": f"https://example.com/{index}"},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={CONF_FORECAST_ATTRIBUTES: mode},
+            source=SOURCE_USER,
+            subentries_data=None,
+            title=f"Spot {index}",
+            unique_id=f"spot{index}",
+            version=1,
+        )
+        self.coordinator = SurfForecastDataUpdateCoordinator(
+            hass=hass,
+            logger=LOGGER,
+            name=DOMAIN,
+            config_entry=self.entry,
+            hub=hub,  # type: ignore[arg-type]
+        )
+        self.rating = SurflineRatingSensor(self.coordinator, self.entry)
+        self.first_met = SurflineFirstMetConditionSensor(self.coordinator, self.entry)
+        self.incoming = SurflineConditionBinarySensor(self.coordinator, self.entry)
+        for entity, entity_id in (
+            (self.rating, f"sensor.spot_{index}_surf_rating"),
+            (self.first_met, f"sensor.spot_{index}_incoming_surf_date"),
+            (self.incoming, f"binary_sensor.spot_{index}_incoming_surf"),
+        ):
+            entity.hass = hass
+            entity.entity_id = entity_id
+
+    def write_states(self, hass: HomeAssistant) -> None:
+        """Write the state of every entity of the spot."""
+        _write_state(hass, self.rating, self.rating.native_value)
+        _write_state(hass, self.first_met, self.first_met.native_value)
+        _write_state(
+            hass, self.incoming, STATE_ON if self.incoming.is_on else STATE_OFF
+        )
+
+
+def _write_state(hass: HomeAssistant, entity: Entity, state: Any) -> None:
+    """Write the state and attributes an entity computes to the state machine."""
+    hass.states.async_set(
+        entity.entity_id,
+        str(state),
+        {"icon": entity.icon, **(entity.extra_state_attributes or {})},
+    )
+
+
+def _now_hour() -> int:
+    """Return the start of the current hour, so the forecast is upcoming."""
+    now = int(time.time())
+    return now - now % 3600
+
+
+async def _async_bench_entities(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Measure the entity properties and attributes of one spot."""
+    results = []
+    for days in HORIZONS:
+        for interval_hours in INTERVALS:
+            body = ratings_body(days, interval_hours, start=_now_hour())
+            for mode in FORECAST_ATTRIBUTES_MODES:
+                spot = _Spot(hass, _BenchHub(body), 0, mode)
+                await spot.coordinator.async_refresh()
+                params = {
+                    "days": days,
+                    "interval_hours": interval_hours,
+                    "mode": mode,
+                }
+                rating = spot.rating
+                results.append(
+                    result(
+                        "entity.extra_state_attributes",
+                        params,
+                        **measure(lambda rating=rating: rating.extra_state_attributes),
+                        **measure_peak(
+                            lambda rating=rating: rating.extra_state_attributes
+                        ),
+                    )
+                )
+                attributes = rating.extra_state_attributes
+                results.append(
+                    result(
+                        "entity.attributes_json",
+                        params,
+                        attributes_bytes=len(json_bytes(attributes)),
+                        **measure(lambda attributes=attributes: json_bytes(attributes)),
+                    )
+                )
+            # The remaining properties do not depend on the attributes mode
+            results.extend(
+                _bench_properties(
+                    spot, {"days": days, "interval_hours": interval_hours}
+                )
+            )
+    return results
+
+
+def _bench_properties(spot: _Spot, params: dict[str, Any]) -> list[dict[str, Any]]:
+    """Measure the state properties of the entities of a refreshed spot."""
+    rating, first_met, incoming = spot.rating, spot.first_met, spot.incoming
+    return [
+        result(name, params, **measure(func, number=2000))
+        for name, func in (
+            ("entity.rating.native_value", lambda: rating.native_value),
+            ("entity.rating.icon", lambda: rating.icon),
+            ("entity.first_met.native_value", lambda: first_met.native_value),
+            ("entity.incoming.is_on", lambda: incoming.is_on),
+        )
+    ]
+
+
+async def _async_bench_updates(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Measure a refresh of every spot and the state writes that follow it."""
+    results = []
+    days, interval_hours = max(HORIZONS), min(INTERVALS)
+    # Alternate between two forecasts so every refresh changes the data
+    bodies = [
+        ratings_body(days, interval_hours, seed=seed, start=_now_hour())
+        for seed in (0, 1)
+    ]
+    for spot_count in SPOT_COUNTS:
+        params = {"days": days, "interval_hours": interval_hours, "spots": spot_count}
+        refresh_us, write_us = await _async_bench_update_cycle(hass, bodies, spot_count)
+        results.append(
+            result(
+                "update.refresh",
+                params,
+                wall_us=round(refresh_us, 2),
+                per_spot_us=round(refresh_us / spot_count, 2),
+            )
+        )
+        results.append(
+            result(
+                "update.state_write",
+                params,
+                wall_us=round(write_us, 2),
+                per_spot_us=round(write_us / spot_count, 2),
+            )
+        )
+    return results
+
+
+async def _async_bench_update_cycle(
+    hass: HomeAssistant, bodies: list[bytes], spot_count: int
+) -> tuple[float, float]:
+    """Return the best refresh and state write times of spot_count spots."""
+    hub = _BenchHub(bodies[0])
+    spots = [
+        _Spot(hass, hub, index, FORECAST_ATTRIBUTES_MODES[1])
+        for index in range(spot_count)
+    ]
+    refresh_us = write_us = float("inf")
+    for cycle in range(REPEAT):
+        hub.body = bodies[cycle % 2]
+        start = time.perf_counter()
+        await asyncio.gather(*(spot.coordinator.async_refresh() for spot in spots))
+        refreshed = time.perf_counter()
+        for spot in spots:
+            spot.write_states(hass)
+        written = time.perf_counter()
+        refresh_us = min(refresh_us, (refreshed - start) * 1e6)
+        write_us = min(write_us, (written - refreshed) * 1e6)
+    return refresh_us, write_us
+
+
+async def async_run() -> list[dict[str, Any]]:
+    """Run the entity and update benchmarks in a throwaway Home Assistant."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            return [
+                *await _async_bench_entities(hass),
+                *await _async_bench_updates(hass),
+            ]
+        finally:
+            await hass.async_stop(force=True)
+
+
+def run() -> list[dict[str, Any]]:
+    """Run the entity and update benchmarks."""
+    return asyncio.run(async_run())
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
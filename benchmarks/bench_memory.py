@@ -0,0 +1,49 @@
+"""
+Compare the memory the forecasts of many spots keep alive.
+
+The baseline is the previous coordinator data: the ratings response decoded
+into dicts and lists. The compact shape is the array-backed ForecastTimeline.
+Both are built for every spot and kept, and the bytes and blocks still traced
+once built are reported side by side.
+
+Run from the repository root with `python -m benchmarks.bench_memory`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from custom_components.surf_forecast.models import ForecastTimeline
+
+from .harness import measure_retained, result
+from .payloads import ratings_body
+
+# 50 spots with 16 days of hourly slots, the largest common setup
+SPOTS = 50
+DAYS = 16
+INTERVAL_HOURS = 1
+
+
+def run() -> list[dict[str, Any]]:
+    """Run the retained memory comparison."""
+    bodies = [
+        ratings_body(days=DAYS, interval_hours=INTERVAL_HOURS, seed=seed)
+        for seed in range(SPOTS)
+    ]
+    params = {"spots": SPOTS, "days": DAYS, "interval_hours": INTERVAL_HOURS}
+    return [
+        result(
+            name,
+            params,
+            **measure_retained(lambda decode=decode: [decode(raw) for raw in bodies]),
+        )
+        for name, decode in (
+            ("memory.payload_dicts", json.loads),
+            ("memory.timeline", ForecastTimeline.from_bytes),
+        )
+    ]
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
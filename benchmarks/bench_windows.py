@@ -0,0 +1,91 @@
+"""
+Measure the surf window search over the ratings of many spots.
+
+Every spot is searched for windows of several lengths at FAIR or better, with
+and without the daylight restriction, over the first five days of forecast.
+
+Run from the repository root with `python -m benchmarks.bench_windows`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from custom_components.surf_forecast.models import RATING_INDEX, ForecastTimeline
+from custom_components.surf_forecast.windows import find_windows
+
+from .harness import HORIZONS, INTERVALS, SPOT_COUNTS, measure, result
+from .payloads import START_TIMESTAMP, ratings_body
+
+# Window lengths in hours searched for on every spot
+WINDOW_HOURS = (1, 3, 6)
+# Horizon of the search and the place the daylight mask is computed for
+SEARCH_DAYS = 5
+LOCATION = (43.4832, -1.5559)
+
+
+def _search(
+    timelines: list[ForecastTimeline], interval_hours: int, *, daylight: bool
+) -> int:
+    """Search every spot for every window length and return the windows found."""
+    found = 0
+    for timeline in timelines:
+        for hours in WINDOW_HOURS:
+            found += len(
+                find_windows(
+                    timeline,
+                    RATING_INDEX["FAIR"],
+                    hours,
+                    start=START_TIMESTAMP,
+                    end=START_TIMESTAMP + SEARCH_DAYS * 86400,
+                    slot_seconds=interval_hours * 3600,
+                    daylight_at=LOCATION if daylight else None,
+                )
+            )
+    return found
+
+
+def run() -> list[dict[str, Any]]:
+    """Run the window search for every horizon, interval and spot count."""
+    results = []
+    for days in HORIZONS:
+        for interval_hours in INTERVALS:
+            for spot_count in SPOT_COUNTS:
+                timelines = [
+                    ForecastTimeline.from_bytes(
+                        ratings_body(days, interval_hours, seed=seed)
+                    )
+                    for seed in range(spot_count)
+                ]
+                for daylight in (False, True):
+                    params = {
+                        "days": days,
+                        "interval_hours": interval_hours,
+                        "spots": spot_count,
+                        "daylight": daylight,
+                    }
+                    timing = measure(
+                        lambda timelines=timelines,
+                        interval_hours=interval_hours,
+                        daylight=daylight: _search(
+                            timelines, interval_hours, daylight=daylight
+                        ),
+                        number=max(1000 // spot_count, 1),
+                    )
+                    results.append(
+                        result(
+                            "windows.search",
+                            params,
+                            windows=_search(
+                                timelines, interval_hours, daylight=daylight
+                            ),
+                            per_spot_us=round(timing["wall_us"] / spot_count, 2),
+                            **timing,
+                        )
+                    )
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))  # noqa: T201
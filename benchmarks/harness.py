@@ -0,0 +1,88 @@
+"""Timing helpers and the result format shared by every benchmark."""
+
+from __future__ import annotations
+
+import time
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+# Horizons in days, slot intervals in hours and spot counts the suites cover
+HORIZONS = (5, 10, 16)
+INTERVALS = (1, 3)
+SPOT_COUNTS = (1, 10, 100, 500)
+REPEAT = 7
+# Allocations of tracemalloc itself, left out of every measurement
+_UNTRACED = [tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)]
+
+
+def result(name: str, params: dict[str, Any], **metrics: Any) -> dict[str, Any]:
+    """Return one benchmark record, identified by its name and parameters."""
+    return {"name": name, "params": params, **metrics}
+
+
+def result_key(record: dict[str, Any]) -> str:
+    """Return the key matching a record across runs."""
+    params = ",".join(
+        f"{key}={value}" for key, value in sorted(record["params"].items())
+    )
+    return f"{record['name']}[{params}]"
+
+
+def measure(func: Callable[[], Any], number: int = 200) -> dict[str, float]:
+    """Return the best wall time of a call over REPEAT rounds, in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=REPEAT))
+    return {"wall_us": round(best / number * 1e6, 2)}
+
+
+def measure_peak(func: Callable[[], Any]) -> dict[str, int]:
+    """
+    Return the allocation peak of a single call, in bytes, and its blocks.
+
+    blocks counts the memory blocks allocated by the call and still alive when
+    it returns, its result included; blocks freed before that only show in the
+    peak.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        kept = func()  # noqa: F841
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {"peak_bytes": peak - start, "blocks": blocks}
+
+
+def measure_retained(func: Callable[[], Any]) -> dict[str, int]:
+    """Return the bytes and blocks still held by the result of a call."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+        kept = func()  # noqa: F841
+        after = tracemalloc.take_snapshot().filter_traces(_UNTRACED)
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "retained_bytes": sum(stat.size_diff for stat in stats),
+        "retained_blocks": sum(stat.count_diff for stat in stats),
+    }
+
+
+async def async_measure(
+    func: Callable[[], Awaitable[Any]], repeat: int = REPEAT
+) -> dict[str, float]:
+    """Return the best wall time of an awaited call, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    return {"wall_us": round(best * 1e6, 2)}
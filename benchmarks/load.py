@@ -0,0 +1,144 @@
+"""
+Drive many simulated spots through the real refresh path against the stand-in.
+
+    python -m benchmarks.load [--spots 200] [--rounds 5]
+                              [--max-concurrent-requests 4] [--change-rate 0.2]
+                              [--latency 0.05] [--rate-limited 0.01] ...
+
+Starts the Surfline stand-in (benchmarks.standin) on a free port and a
+throwaway HomeAssistant, then sets up the real hub, API client and one
+coordinator per simulated config entry. Every round refreshes all spots at
+once, as the hub does when they fall due together, so requests go through the
+concurrency limit, conditional requests, retries and decoding.
+
+Prints throughput, the refresh latency percentiles, failures and the client
+and stand-in counters as JSON. Needs Home Assistant installed (scripts/setup).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import ClientSession
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.surf_forecast.api import SurfForecastIntegrationApiClient
+from custom_components.surf_forecast.const import DOMAIN
+from custom_components.surf_forecast.coordinator import (
+    SurfForecastDataUpdateCoordinator,
+)
+from custom_components.surf_forecast.hub import SurfForecastHub
+from custom_components.surf_forecast.metrics import RollingHistogram
+
+from .standin import SurflineStandin, add_fault_arguments, fault_profile
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _coordinator(
+    hass: HomeAssistant, hub: SurfForecastHub, index: int
+) -> SurfForecastDataUpdateCoordinator:
+    """Create the config entry and coordinator of a simulated spot."""
+    entry = ConfigEntry(
+        data={"spot_id": f"spot{index}", "href": f"https://example.com/{index}"},
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=SOURCE_USER,
+        subentries_data=None,
+        title=f"Spot {index}",
+        unique_id=f"spot{index}",
+        version=1,
+    )
+    return SurfForecastDataUpdateCoordinator(
+        hass=hass, logger=LOGGER, name=DOMAIN, config_entry=entry, hub=hub
+    )
+
+
+async def _async_timed_refresh(
+    coordinator: SurfForecastDataUpdateCoordinator,
+) -> tuple[float, bool]:
+    """Refresh a spot; return the wall time in ms and whether it succeeded."""
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    return (time.perf_counter() - start) * 1000, coordinator.last_update_success
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the load rounds and return the report."""
+    standin = SurflineStandin(
+        spot_count=args.spots,
+        faults=fault_profile(args),
+        change_rate=args.change_rate,
+    )
+    runner = await standin.async_start()
+    host, port = runner.addresses[0][:2]
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        session = ClientSession()
+        try:
+            # No reuse window: every round must reach the stand-in
+            client = SurfForecastIntegrationApiClient(
+                session, base_url=f"http://{host}:{port}", reuse_window=0
+            )
+            hub = SurfForecastHub(
+                hass, client, max_concurrent_requests=args.max_concurrent_requests
+            )
+            coordinators = [
+                _coordinator(hass, hub, index) for index in range(args.spots)
+            ]
+            latency = RollingHistogram(window=args.spots * args.rounds)
+            failures = 0
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for refresh_ms, success in await asyncio.gather(
+                    *(_async_timed_refresh(coordinator) for coordinator in coordinators)
+                ):
+                    latency.add(refresh_ms)
+                    failures += not success
+            elapsed = time.perf_counter() - start
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+        finally:
+            await session.close()
+            await runner.cleanup()
+            await hass.async_stop(force=True)
+    refreshes = args.spots * args.rounds
+    return {
+        "params": {
+            "spots": args.spots,
+            "rounds": args.rounds,
+            "max_concurrent_requests": args.max_concurrent_requests,
+            "change_rate": args.change_rate,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "refreshes_per_s": round(refreshes / elapsed, 2),
+        "failures": failures,
+        "refresh_ms": latency.summary(),
+        "client": client.diagnostics(),
+        "standin": dict(standin.stats),
+    }
+
+
+def main() -> None:
+    """Parse the command line, run the load and print the report."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--spots", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-concurrent-requests", type=int, default=4)
+    parser.add_argument("--change-rate", type=float, default=0.2)
+    add_fault_arguments(parser)
+    print(json.dumps(asyncio.run(async_run(parser.parse_args())), indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
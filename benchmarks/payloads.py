@@ -0,0 +1,141 @@
+"""Synthetic Surfline payloads for the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+from custom_components.surf_forecast.const import SURFLINE_RATING_LEVELS
+
+# Start of the first synthetic slot, aligned to an hour
+START_TIMESTAMP = 1_759_996_800
+
+
+def ratings_payload(
+    days: int = 5,
+    interval_hours: int = 1,
+    seed: int = 0,
+    start: int = START_TIMESTAMP,
+) -> dict[str, Any]:
+    """Return a ratings response shaped like Surfline's, with random ratings."""
+    rng = random.Random(seed)  # noqa: S311
+    slots = days * 24 // interval_hours
+    return {
+        "associated": {
+            "location": {"lon": -1.5559, "lat": 43.4832},
+            "runInitializationTimestamp": start,
+        },
+        "data": {
+            "rating": [
+                {
+                    "timestamp": start + index * interval_hours * 3600,
+                    "probability": None,
+                    "utcOffset": 2,
+                    "rating": {
+                        "key": (key := rng.choice(SURFLINE_RATING_LEVELS)),
+                        "value": SURFLINE_RATING_LEVELS.index(key),
+                    },
+                }
+                for index in range(slots)
+            ]
+        },
+    }
+
+
+def ratings_body(
+    days: int = 5,
+    interval_hours: int = 1,
+    seed: int = 0,
+    start: int = START_TIMESTAMP,
+) -> bytes:
+    """Return a ratings response body as the server would send it."""
+    return json.dumps(
+        ratings_payload(days, interval_hours, seed, start), separators=(",", ":")
+    ).encode()
+
+
+def conditions_payload(
+    endpoint: str,
+    days: int = 5,
+    interval_hours: int = 1,
+    seed: int = 0,
+    start: int = START_TIMESTAMP,
+) -> dict[str, Any]:
+    """Return a wave, wind, swells or tides response shaped like Surfline's."""
+    rng = random.Random(seed)  # noqa: S311
+    timestamps = [
+        start + index * interval_hours * 3600
+        for index in range(days * 24 // interval_hours)
+    ]
+    slots: list[dict[str, Any]]
+    if endpoint == "wave":
+        slots = [
+            {
+                "timestamp": timestamp,
+                "surf": {
+                    "min": (low := round(rng.uniform(0.2, 2.5), 1)),
+                    "max": round(low + rng.uniform(0.1, 1.0), 1),
+                },
+            }
+            for timestamp in timestamps
+        ]
+    elif endpoint == "wind":
+        slots = [
+            {
+                "timestamp": timestamp,
+                "speed": (speed := round(rng.uniform(0, 40), 1)),
+                "direction": round(rng.uniform(0, 360), 1),
+                "gust": round(speed * rng.uniform(1.1, 1.6), 1),
+            }
+            for timestamp in timestamps
+        ]
+    elif endpoint == "swells":
+        slots = [
+            {
+                "timestamp": timestamp,
+                "swells": [
+                    {
+                        "height": round(rng.uniform(0, 3), 2),
+                        "period": rng.randint(4, 20),
+                        "direction": round(rng.uniform(0, 360), 1),
+                    }
+                    for _ in range(6)
+                ],
+            }
+            for timestamp in timestamps
+        ]
+    else:
+        slots = [
+            {
+                "timestamp": timestamp,
+                "type": "NORMAL",
+                "height": round(1.5 + rng.uniform(-1.5, 1.5), 2),
+            }
+            for timestamp in timestamps
+        ]
+    return {"associated": {"units": {"waveHeight": "M"}}, "data": {endpoint: slots}}
+
+
+def search_payload(query: str, spot_count: int) -> list[dict[str, Any]]:
+    """Return search result sets listing the synthetic spots matching a query."""
+    rng = random.Random(0)  # noqa: S311
+    hits = []
+    for index in range(spot_count):
+        latitude, longitude = rng.uniform(-60, 60), rng.uniform(-180, 180)
+        name = f"Spot {index}"
+        if query.casefold() not in name.casefold():
+            continue
+        hits.append(
+            {
+                "_id": f"spot{index}",
+                "_index": "spots",
+                "_source": {
+                    "name": name,
+                    "breadCrumbs": ["Country", "Region", f"City {index}"],
+                    "location": {"lat": latitude, "lon": longitude},
+                    "href": f"https://www.surfline.com/surf-report/spot-{index}",
+                },
+            }
+        )
+    return [{"hits": {"hits": hits[:10]}}, {"hits": {"hits": []}}]
@@ -0,0 +1,262 @@
+"""
+Local stand-in for the Surfline endpoints the API client calls.
+
+    python -m benchmarks.standin [--port 8765] [--spots 500]
+                                 [--recordings DIR] [--record URL]
+                                 [--latency 0.05] [--jitter 0.02]
+                                 [--rate-limited 0.01] [--server-errors 0.01]
+                                 [--truncated 0.01] [--slow-streams 0.01]
+
+Serves the spot search and the forecasts/rating, wave, wind, swells and tides
+endpoints. A body recorded in DIR/<endpoint>/<spotId>.json is replayed as is;
+any other spot gets a synthetic forecast starting at the current hour, so any
+number of spots can be served. With --record, requests are forwarded to the
+given server and its bodies saved to DIR for later replays.
+
+Every response carries an ETag and honours If-None-Match. Faults are injected
+per request with the given probabilities: 429 with Retry-After, 503, a body cut
+off mid-stream, or a body trickled out in slow chunks. GET /stats returns what
+was served. Point the API client at it with base_url=http://127.0.0.1:8765.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, hdrs, web
+
+from .payloads import conditions_payload, ratings_payload, search_payload
+
+if TYPE_CHECKING:
+    from aiohttp.web_runner import AppRunner
+
+FORECAST_ENDPOINTS = ("rating", "wave", "wind", "swells", "tides")
+# Chunks a slow stream is split into
+SLOW_STREAM_CHUNKS = 16
+
+
+@dataclass(frozen=True, kw_only=True)
+class FaultProfile:
+    """Latency and failure probabilities applied to every request."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limited: float = 0.0
+    retry_after: int = 1
+    server_errors: float = 0.0
+    truncated: float = 0.0
+    slow_streams: float = 0.0
+    # Seconds a slow stream takes to deliver the whole body
+    slow_stream_duration: float = 2.0
+
+
+class SurflineStandin:
+    """Serve recorded or synthetic Surfline responses with injected faults."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        spot_count: int = 500,
+        faults: FaultProfile | None = None,
+        recordings: Path | None = None,
+        record_from: str | None = None,
+        change_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the stand-in."""
+        self.spot_count = spot_count
+        self.faults = faults or FaultProfile()
+        self.recordings = recordings
+        self.record_from = record_from.rstrip("/") if record_from else None
+        # Probability that a spot has a new forecast run on a request
+        self.change_rate = change_rate
+        self.rng = random.Random(seed)  # noqa: S311
+        self.stats: Counter[str] = Counter()
+        self._revisions: Counter[str] = Counter()
+        self._upstream: ClientSession | None = None
+
+    def app(self) -> web.Application:
+        """Return the web application serving the endpoints."""
+        app = web.Application()
+        app.router.add_get("/search/site", self._handle_search)
+        app.router.add_get("/kbyg/spots/forecasts/{endpoint}", self._handle_forecast)
+        app.router.add_get("/stats", self._handle_stats)
+        app.on_cleanup.append(self._close_upstream)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> AppRunner:
+        """Start serving and return the runner; port 0 picks a free port."""
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    async def _handle_search(self, request: web.Request) -> web.StreamResponse:
+        """Answer a spot search."""
+        self.stats["search"] += 1
+        if (body := await self._recorded(request, "search", "search")) is None:
+            body = _dumps(search_payload(request.query.get("q", ""), self.spot_count))
+        return await self._respond(request, body)
+
+    async def _handle_forecast(self, request: web.Request) -> web.StreamResponse:
+        """Answer a forecast request for one spot."""
+        endpoint = request.match_info["endpoint"]
+        if endpoint not in FORECAST_ENDPOINTS:
+            raise web.HTTPNotFound
+        spot_id = request.query.get("spotId", "")
+        self.stats[endpoint] += 1
+        if (body := await self._recorded(request, endpoint, spot_id)) is None:
+            body = self._synthetic(request, endpoint, spot_id)
+        return await self._respond(request, body)
+
+    async def _handle_stats(self, _request: web.Request) -> web.Response:
+        """Return the counts of requests and injected faults."""
+        return web.json_response(dict(self.stats))
+
+    def _synthetic(self, request: web.Request, endpoint: str, spot_id: str) -> bytes:
+        """Return a synthetic forecast, stable until the spot gets a new run."""
+        if self.rng.random() < self.change_rate:
+            self._revisions[spot_id] += 1
+        seed = zlib.crc32(f"{spot_id}:{self._revisions[spot_id]}".encode())
+        days = int(request.query.get("days", 5))
+        interval_hours = int(request.query.get("intervalHours", 1))
+        now = int(time.time())
+        start = now - now % 3600
+        if endpoint == "rating":
+            return _dumps(ratings_payload(days, interval_hours, seed, start))
+        return _dumps(conditions_payload(endpoint, days, interval_hours, seed, start))
+
+    async def _recorded(
+        self, request: web.Request, endpoint: str, name: str
+    ) -> bytes | None:
+        """Return the recorded body of a request, recording it first if asked."""
+        if self.recordings is None or not name:
+            return None
+        path = self.recordings / endpoint / f"{Path(name).name}.json"
+        if self.record_from is not None:
+            if self._upstream is None:
+                self._upstream = ClientSession()
+            async with self._upstream.get(
+                f"{self.record_from}{request.path_qs}"
+            ) as upstream:
+                upstream.raise_for_status()
+                body = await upstream.read()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            self.stats["recorded"] += 1
+            return body
+        if not path.is_file():
+            return None
+        self.stats["replayed"] += 1
+        return path.read_bytes()
+
+    async def _respond(self, request: web.Request, body: bytes) -> web.StreamResponse:
+        """Send a body, or the fault drawn for this request."""
+        faults, rng = self.faults, self.rng
+        if delay := max(faults.latency + rng.uniform(-1, 1) * faults.jitter, 0.0):
+            await asyncio.sleep(delay)
+        draw = rng.random()
+        if (draw := draw - faults.rate_limited) < 0:
+            self.stats["rate_limited"] += 1
+            return web.Response(
+                status=429, headers={hdrs.RETRY_AFTER: str(faults.retry_after)}
+            )
+        if (draw := draw - faults.server_errors) < 0:
+            self.stats["server_errors"] += 1
+            return web.Response(status=503)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        response = web.StreamResponse(
+            headers={hdrs.ETAG: etag, hdrs.CONTENT_TYPE: "application/json"}
+        )
+        response.content_length = len(body)
+        await response.prepare(request)
+        if (draw := draw - faults.truncated) < 0:
+            self.stats["truncated"] += 1
+            await response.write(body[: len(body) // 2])
+            # Drop the connection with the announced length unmet
+            if request.transport is not None:
+                request.transport.close()
+            return response
+        if draw - faults.slow_streams < 0:
+            self.stats["slow_streams"] += 1
+            size = -(-len(body) // SLOW_STREAM_CHUNKS)
+            for offset in range(0, len(body), size):
+                await asyncio.sleep(faults.slow_stream_duration / SLOW_STREAM_CHUNKS)
+                await response.write(body[offset : offset + size])
+        else:
+            self.stats["ok"] += 1
+            await response.write(body)
+        await response.write_eof()
+        return response
+
+    async def _close_upstream(self, _app: web.Application) -> None:
+        """Close the session used for recording."""
+        if self._upstream is not None:
+            await self._upstream.close()
+
+
+def _dumps(payload: object) -> bytes:
+    """Return a compact JSON body."""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fault injection options to a command line parser."""
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--rate-limited", type=float, default=0.0)
+    parser.add_argument("--server-errors", type=float, default=0.0)
+    parser.add_argument("--truncated", type=float, default=0.0)
+    parser.add_argument("--slow-streams", type=float, default=0.0)
+
+
+def fault_profile(args: argparse.Namespace) -> FaultProfile:
+    """Return the fault profile given on the command line."""
+    return FaultProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limited=args.rate_limited,
+        server_errors=args.server_errors,
+        truncated=args.truncated,
+        slow_streams=args.slow_streams,
+    )
+
+
+def main() -> None:
+    """Serve the stand-in until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.standin")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spots", type=int, default=500)
+    parser.add_argument("--recordings", type=Path)
+    parser.add_argument("--record", metavar="URL")
+    parser.add_argument("--change-rate", type=float, default=0.0)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    if args.record and args.recordings is None:
+        parser.error("--record needs --recordings")
+    standin = SurflineStandin(
+        spot_count=args.spots,
+        faults=fault_profile(args),
+        recordings=args.recordings,
+        record_from=args.record,
+        change_rate=args.change_rate,
+    )
+    web.run_app(standin.app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,19 +7,46 @@ https://github.com/victorigualada/surf_forecast_integration
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
+import voluptuous as vol
 from homeassistant.const import Platform
+from homeassistant.helpers import discovery
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import async_get_loaded_integration
+from homeassistant.util import dt as dt_util
 
 from .api import SurfForecastIntegrationApiClient
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_ARCHIVE_DAYS,
+    CONF_BEST_SPOT_HOURS,
+    CONF_DAILY_REQUEST_BUDGET,
+    CONF_FORECAST_DAYS,
+    CONF_FORECAST_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SNAPSHOT_AGE,
+    DEFAULT_ARCHIVE_DAYS,
+    DEFAULT_BEST_SPOT_HOURS,
+    DEFAULT_DAILY_REQUEST_BUDGET,
+    DEFAULT_FORECAST_DAYS,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SNAPSHOT_AGE,
+    DOMAIN,
+    LIVE_OPTIONS,
+    LOGGER,
+    UPDATE_INTERVAL,
+)
 from .coordinator import SurfForecastDataUpdateCoordinator
 from .data import SurfForecastIntegrationData
+from .hub import SurfForecastHub
+from .scheduler import AdaptivePollScheduler
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import SurfForecastIntegrationConfigEntry
 
@@ -29,6 +56,68 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                vol.Optional(
+                    CONF_DAILY_REQUEST_BUDGET,
+                    default=DEFAULT_DAILY_REQUEST_BUDGET,
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_BEST_SPOT_HOURS,
+                    default=DEFAULT_BEST_SPOT_HOURS,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=384)),
+                vol.Optional(
+                    CONF_ARCHIVE_DAYS,
+                    default=DEFAULT_ARCHIVE_DAYS,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the shared hub that refreshes every configured spot."""
+    domain_config = config.get(DOMAIN, {})
+    # A config flow searching spots before setup made a hub: keep its client
+    if (hub := hass.data.get(DOMAIN)) is not None:
+        client = hub.client
+    else:
+        client = SurfForecastIntegrationApiClient(
+            session=async_get_clientsession(hass),
+        )
+    hass.data[DOMAIN] = hub = SurfForecastHub(
+        hass,
+        client=client,
+        max_concurrent_requests=domain_config.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        scheduler=AdaptivePollScheduler(
+            daily_request_budget=domain_config.get(
+                CONF_DAILY_REQUEST_BUDGET, DEFAULT_DAILY_REQUEST_BUDGET
+            ),
+        ),
+        best_spot_hours=domain_config.get(
+            CONF_BEST_SPOT_HOURS, DEFAULT_BEST_SPOT_HOURS
+        ),
+        archive_days=domain_config.get(CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS),
+    )
+    await hub.snapshots.async_load()
+    async_setup_services(hass)
+    # The best spot sensors belong to no spot, so they are not tied to an entry
+    hass.async_create_task(
+        discovery.async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config),
+        eager_start=True,
+    )
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -36,22 +125,46 @@ async def async_setup_entry(
     entry: SurfForecastIntegrationConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    hub: SurfForecastHub = hass.data[DOMAIN]
     coordinator = SurfForecastDataUpdateCoordinator(
         hass=hass,
         logger=LOGGER,
         name=DOMAIN,
         config_entry=entry,
+        hub=hub,
     )
     entry.runtime_data = SurfForecastIntegrationData(
-        client=SurfForecastIntegrationApiClient(
-            session=async_get_clientsession(hass),
-        ),
+        client=hub.client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        hub=hub,
+        reload_options=_reload_options(entry),
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    snapshot = await hub.snapshots.async_get(
+        entry.data["spot_id"],
+        days=entry.options.get(CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS),
+        interval_hours=entry.options.get(
+            CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL
+        ),
+    )
+    max_age = timedelta(
+        hours=entry.options.get(CONF_MAX_SNAPSHOT_AGE, DEFAULT_MAX_SNAPSHOT_AGE)
+    )
+    if snapshot is not None and dt_util.utcnow() - snapshot[1] <= max_age:
+        # Stale-while-revalidate: come up from the stored forecast right away
+        timeline, fetched_at = snapshot
+        coordinator.async_set_snapshot(timeline, fetched_at)
+        if dt_util.utcnow() - fetched_at >= UPDATE_INTERVAL:
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                name=f"{DOMAIN} {entry.title} revalidate snapshot",
+            )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(hub.async_register(coordinator))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -67,9 +180,36 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: SurfForecastIntegrationConfigEntry,
+) -> None:
+    """Forget the stored snapshot, conditions and archive of a removed spot."""
+    hub: SurfForecastHub = hass.data[DOMAIN]
+    hub.snapshots.async_remove(entry.data["spot_id"])
+    hub.client.forget_conditions(entry.data["spot_id"])
+    await hub.archive.async_remove(entry.data["spot_id"])
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: SurfForecastIntegrationConfigEntry,
 ) -> None:
-    """Reload config entry."""
+    """Reload config entry, or apply live option changes in place."""
+    if _reload_options(entry) == entry.runtime_data.reload_options:
+        # Only live options changed: recompute entities from the cached forecast
+        entry.runtime_data.coordinator.async_apply_live_options()
+        return
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _reload_options(entry: SurfForecastIntegrationConfigEntry) -> dict:
+    """Return the entry settings whose change requires a full reload."""
+    return {
+        "data": dict(entry.data),
+        "options": {
+            key: value
+            for key, value in entry.options.items()
+            if key not in LIVE_OPTIONS
+        },
+    }
@@ -2,16 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import json
+import random
 import socket
-from typing import Any
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
+from aiohttp import hdrs
+from yarl import URL
 
-SURFLINE_SEARCH_URL = "https://services.surfline.com/search/site?q=${spot_name_or_city_name}&querySize=10&suggestionSize=10&newsSearch=false^&includeWavePools=false"
-SURFLINE_RATINGS_URL = "https://services.surfline.com/kbyg/spots/forecasts/ratings"
+from .const import CONDITION_TTLS, LOGGER
+from .models import ForecastTimeline, parse_conditions
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
-"""Sample API Client."""
+    from .metrics import SpotMetrics
+    from .models import ConditionSeries
+
+SURFLINE_BASE_URL = "https://services.surfline.com"
+SURFLINE_SEARCH_PATH = "/search/site"
+SURFLINE_FORECASTS_PATH = "/kbyg/spots/forecasts"
+# Metric units for the condition endpoints, whatever the Surfline defaults are
+CONDITION_UNITS = {
+    "units[waveHeight]": "M",
+    "units[swellHeight]": "M",
+    "units[tideHeight]": "M",
+    "units[windSpeed]": "KPH",
+}
+# Most hits Surfline returns per result set of a search
+SEARCH_QUERY_SIZE = 10
+# A search is typed in a config flow: it gets one attempt of at most this long
+SEARCH_TIMEOUT = 10.0
+
+# Attempts per request, including the first one
+MAX_ATTEMPTS = 3
+# Exponential backoff with full jitter between attempts, in seconds
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+# A 429 asking to wait longer than this is not retried
+MAX_RETRY_AFTER = 120.0
+# Consecutive failures opening the circuit of a host, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60.0
+# Response bodies at least this large are decoded in the executor
+EXECUTOR_DECODE_THRESHOLD = 64 * 1024
+# How long the result of a request is reused by identical requests, in seconds
+COALESCE_REUSE_WINDOW = 5.0
 
 
 class SurfForecastIntegrationApiClientError(Exception):
@@ -30,6 +72,23 @@ class SurfForecastIntegrationApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class SurfForecastIntegrationApiClientRateLimitError(
+    SurfForecastIntegrationApiClientCommunicationError,
+):
+    """Exception to indicate the API asked to slow down."""
+
+    def __init__(self, msg: str, retry_after: float | None = None) -> None:
+        """Initialize with the delay requested by the server, if any."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class SurfForecastIntegrationApiClientCircuitOpenError(
+    SurfForecastIntegrationApiClientCommunicationError,
+):
+    """Exception to indicate requests to a failing host are short-circuited."""
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid."""
     if response.status in (401, 403):
@@ -37,88 +96,535 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
         raise SurfForecastIntegrationApiClientAuthenticationError(
             msg,
         )
+    if response.status == 429:  # noqa: PLR2004
+        msg = "Rate limited by the API"
+        raise SurfForecastIntegrationApiClientRateLimitError(
+            msg,
+            _parse_retry_after(response.headers.get(hdrs.RETRY_AFTER)),
+        )
     response.raise_for_status()
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait from a Retry-After header."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Stop calling a host after repeated failures.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the circuit opens and
+    requests fail fast. Once the reset timeout elapsed a single probe request is
+    let through: its success closes the circuit, its failure opens it again,
+    and a cancelled probe lets the next request probe instead.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected_count = 0
+        self._open_until: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._open_until is None:
+            return "closed"
+        if self._probing or time.monotonic() >= self._open_until:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> bool:
+        """
+        Raise if the circuit does not allow a request right now.
+
+        Return whether the request is the probe of a half open circuit.
+        """
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected_count += 1
+        msg = "Circuit open: too many recent failures"
+        raise SurfForecastIntegrationApiClientCircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.consecutive_failures = 0
+        self._open_until = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Let another request probe the circuit after a probe was abandoned."""
+        self._probing = False
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Count a failure and open the circuit once the threshold is reached."""
+        self.consecutive_failures += 1
+        if (
+            self._probing
+            or retry_after is not None
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open(retry_after if retry_after is not None else self.reset_timeout)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_count": self.opened_count,
+            "rejected_count": self.rejected_count,
+            "open_for": (
+                max(self._open_until - time.monotonic(), 0.0)
+                if self._open_until is not None
+                else None
+            ),
+        }
+
+    def _open(self, duration: float) -> None:
+        """Reject requests for the given number of seconds."""
+        if self._open_until is None or self._probing:
+            self.opened_count += 1
+        self._open_until = time.monotonic() + duration
+        self._probing = False
+
+
 class SurfForecastIntegrationApiClient:
-    """Sample API Client."""
+    """
+    Client of the Surfline search and forecast endpoints.
+
+    One client is shared by every spot of the hub, so its circuit breakers,
+    condition cache and in-flight requests cover all of them.
+    """
 
     def __init__(
         self,
         session: aiohttp.ClientSession,
+        base_url: str = SURFLINE_BASE_URL,
+        reuse_window: float = COALESCE_REUSE_WINDOW,
     ) -> None:
-        """Sample API Client."""
+        """
+        Initialize the client on a shared aiohttp session.
+
+        base_url points the client at another server, such as a local stand-in
+        for load tests. reuse_window is how long identical requests share one
+        result.
+        """
         self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._reuse_window = reuse_window
+        # Revalidation state of conditional requests, keyed by URL
+        self._validators: dict[str, dict[str, str | None]] = {}
+        # Circuit breakers keyed by host, shared by every caller of this client
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # Condition series keyed by (spot_id, endpoint): the days and interval
+        # they were fetched for, when they expire in monotonic seconds, and data
+        self._conditions: dict[
+            tuple[str, str], tuple[int, int, float, ConditionSeries]
+        ] = {}
+        # Requests in flight and results recently returned, keyed by request
+        self._in_flight: dict[tuple[str, str, bool], asyncio.Future[Any]] = {}
+        self._recent: dict[tuple[str, str, bool], tuple[float, Any]] = {}
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "rate_limited": 0,
+            "coalesced": 0,
+            "reused": 0,
+        }
 
     async def async_search_spots(self, query: str) -> list[dict[str, Any]]:
         """
         Search for surf spots by name or city.
 
-        Uses the correct Surfline search URL.
+        A spot returned by several result sets is listed once.
         """
-        url = (
-            "https://services.surfline.com/search/site"
-            f"?q={query}&querySize=10&suggestionSize=10&newsSearch=true&includeWavePools=false"
+        url = URL(f"{self._base_url}{SURFLINE_SEARCH_PATH}").with_query(
+            q=query,
+            querySize=SEARCH_QUERY_SIZE,
+            suggestionSize=SEARCH_QUERY_SIZE,
+            newsSearch="true",
+            includeWavePools="false",
         )
         response = await self._api_wrapper(
             method="get",
-            url=url,
+            url=str(url),
+            attempts=1,
+            client_timeout=aiohttp.ClientTimeout(total=SEARCH_TIMEOUT),
         )
-        # The response structure may differ from the old endpoint
-        # so adapt parsing as needed
-        spots = []
+        spots: dict[str, dict[str, Any]] = {}
         for result in response if isinstance(response, list) else [response]:
-            hits = result.get("hits", {}).get("hits", [])
-            for hit in hits:
-                src = hit.get("_source", {})
+            for hit in result.get("hits", {}).get("hits", []):
                 spot_id = hit.get("_id")
-                if spot_id is None:
+                if spot_id is None or spot_id in spots:
                     continue
                 if hit.get("_index") != "spots":
                     continue
-                spots.append(
-                    {
-                        "spot_id": spot_id,
-                        "name": src.get("name"),
-                        "city": src.get("breadCrumbs", [None, None, None, None])[-1],
-                        "region": src.get("breadCrumbs", [None, None, None, None])[-2],
-                        "country": src.get("breadCrumbs", [None, None, None, None])[0],
-                        "latitude": src.get("location", {}).get("lat"),
-                        "longitude": src.get("location", {}).get("lon"),
-                        "href": src.get("href"),
-                    }
-                )
-        return spots
+                src = hit.get("_source", {})
+                bread_crumbs = src.get("breadCrumbs") or [None, None]
+                location = src.get("location", {})
+                spots[spot_id] = {
+                    "spot_id": spot_id,
+                    "name": src.get("name"),
+                    "city": bread_crumbs[-1],
+                    "region": bread_crumbs[-2] if len(bread_crumbs) > 1 else None,
+                    "country": bread_crumbs[0],
+                    "latitude": location.get("lat"),
+                    "longitude": location.get("lon"),
+                    "href": src.get("href"),
+                }
+        return list(spots.values())
 
-    async def async_get_ratings(self, spot_id: str) -> dict[str, Any]:
-        """Fetch ratings for a given spot from Surfline API."""
+    async def async_get_forecast(
+        self,
+        spot_id: str,
+        *,
+        days: int = 5,
+        interval_hours: int = 1,
+        conditional: bool = False,
+        metrics: SpotMetrics | None = None,
+    ) -> ForecastTimeline | None:
+        """
+        Fetch the ratings of a spot decoded straight into a forecast timeline.
+
+        The raw body is decoded leanly, off the event loop for large bodies. With
+        conditional set, None is returned when the ratings are unchanged since
+        the last request for the same days and interval. Timings, sizes and
+        outcomes of the requests are recorded in metrics when given.
+        """
         url = (
-            "https://services.surfline.com/kbyg/spots/forecasts/rating"
-            f"?spotId={spot_id}&days=5&intervalHours=1&cacheEnabled=true"
+            f"{self._base_url}{SURFLINE_FORECASTS_PATH}/rating"
+            f"?spotId={spot_id}&days={days}&intervalHours={interval_hours}"
+            "&cacheEnabled=true"
         )
         return await self._api_wrapper(
             method="get",
             url=url,
+            conditional=conditional,
+            decoder=ForecastTimeline.from_bytes,
+            metrics=metrics,
         )
 
-    async def _api_wrapper(
+    def due_conditions(
+        self, spot_id: str, *, days: int, interval_hours: int
+    ) -> list[str]:
+        """Return the condition endpoints of a spot whose values expired."""
+        now = time.monotonic()
+        due = []
+        for endpoint in CONDITION_TTLS:
+            cached = self._conditions.get((spot_id, endpoint))
+            if (
+                cached is None
+                or cached[:2] != (days, interval_hours)
+                or now >= cached[2]
+            ):
+                due.append(endpoint)
+        return due
+
+    def conditions(
+        self, spot_id: str, *, days: int, interval_hours: int
+    ) -> dict[str, ConditionSeries]:
+        """Return the cached condition series of a spot for a horizon."""
+        return {
+            endpoint: cached[3]
+            for endpoint in CONDITION_TTLS
+            if (cached := self._conditions.get((spot_id, endpoint))) is not None
+            and cached[:2] == (days, interval_hours)
+        }
+
+    async def async_get_condition(
+        self,
+        spot_id: str,
+        endpoint: str,
+        *,
+        days: int = 5,
+        interval_hours: int = 1,
+        metrics: SpotMetrics | None = None,
+    ) -> None:
+        """
+        Refresh the cached series of one condition endpoint of a spot.
+
+        The request is revalidated against the cached series, which is kept
+        when unchanged. Conditions complement the ratings, so a failure only
+        keeps the stale series until the next refresh; authentication errors
+        are raised.
+        """
+        key = (spot_id, endpoint)
+        cached = self._conditions.get(key)
+        if cached is not None and cached[:2] != (days, interval_hours):
+            cached = None
+        url = URL(f"{self._base_url}{SURFLINE_FORECASTS_PATH}/{endpoint}").with_query(
+            spotId=spot_id,
+            days=days,
+            intervalHours=interval_hours,
+            cacheEnabled="true",
+            **CONDITION_UNITS,
+        )
+        try:
+            series = await self._api_wrapper(
+                method="get",
+                url=str(url),
+                conditional=cached is not None,
+                decoder=functools.partial(parse_conditions, endpoint),
+                metrics=metrics,
+            )
+        except SurfForecastIntegrationApiClientAuthenticationError:
+            raise
+        except SurfForecastIntegrationApiClientError as exception:
+            LOGGER.debug("Fetching %s of %s failed: %s", endpoint, spot_id, exception)
+            return
+        if series is None and cached is not None:
+            series = cached[3]
+        expires_at = time.monotonic() + CONDITION_TTLS[endpoint].total_seconds()
+        self._conditions[key] = (days, interval_hours, expires_at, series or {})
+
+    def forget_conditions(self, spot_id: str) -> None:
+        """Drop the cached condition series of a removed spot."""
+        for endpoint in CONDITION_TTLS:
+            self._conditions.pop((spot_id, endpoint), None)
+
+    async def _api_wrapper(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        conditional: bool = False,
+        decoder: Callable[[bytes], Any] | None = None,
+        metrics: SpotMetrics | None = None,
+        attempts: int = MAX_ATTEMPTS,
+        client_timeout: aiohttp.ClientTimeout | None = None,
+    ) -> Any:
+        """
+        Get information from the API, coalescing identical requests.
+
+        Requests without a body are keyed by method, URL and whether they are
+        conditional. Callers of a request already in flight share its decoded
+        result or error, and a successful result is reused for the reuse window,
+        so back-to-back refreshes cost one call.
+
+        attempts and client_timeout only apply to the request reaching the API:
+        an identical request already in flight is shared whatever its limits.
+        """
+        if data is not None:
+            return await self._api_with_retries(
+                method,
+                url,
+                data,
+                headers,
+                conditional=conditional,
+                decoder=decoder,
+                metrics=metrics,
+                attempts=attempts,
+                client_timeout=client_timeout,
+            )
+        key = (method, url, conditional)
+        now = time.monotonic()
+        if (recent := self._recent.get(key)) is not None and now < recent[0]:
+            self._count_coalesced("reused", metrics)
+            return recent[1]
+        if (future := self._in_flight.get(key)) is not None:
+            self._count_coalesced("coalesced", metrics)
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._api_with_retries(
+                method,
+                url,
+                data,
+                headers,
+                conditional=conditional,
+                decoder=decoder,
+                metrics=metrics,
+                attempts=attempts,
+                client_timeout=client_timeout,
+            )
+        except asyncio.CancelledError:
+            msg = "Request was cancelled"
+            _fail(future, SurfForecastIntegrationApiClientCommunicationError(msg))
+            raise
+        except Exception as exception:
+            _fail(future, exception)
+            raise
+        else:
+            future.set_result(result)
+            self._remember(key, result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def _count_coalesced(self, outcome: str, metrics: SpotMetrics | None) -> None:
+        """Count a request answered by another identical request."""
+        self.stats[outcome] += 1
+        if metrics is not None:
+            metrics.count("coalesced")
+
+    def _remember(self, key: tuple[str, str, bool], result: Any) -> None:
+        """Keep a result for reuse and forget the expired ones."""
+        now = time.monotonic()
+        self._recent = {
+            recent_key: recent
+            for recent_key, recent in self._recent.items()
+            if now < recent[0]
+        }
+        if self._reuse_window > 0:
+            self._recent[key] = (now + self._reuse_window, result)
+
+    async def _api_with_retries(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        conditional: bool = False,
+        decoder: Callable[[bytes], Any] | None = None,
+        metrics: SpotMetrics | None = None,
+        attempts: int = MAX_ATTEMPTS,
+        client_timeout: aiohttp.ClientTimeout | None = None,
+    ) -> Any:
+        """
+        Get information from the API, retrying transient failures.
+
+        Timeouts, connection errors, 5xx and 429 responses are retried up to
+        MAX_ATTEMPTS times with exponential backoff and full jitter, honouring
+        Retry-After. Failures feed the circuit breaker of the host, which fails
+        fast while the host keeps failing.
+
+        A conditional request returns None when the response did not change
+        since the previous request to the same URL. A decoder turns the raw body
+        into the result instead of the default JSON decoding. attempts lowers
+        the number of attempts, and client_timeout bounds each of them.
+        """
+        breaker = self._breakers.setdefault(URL(url).host or "", CircuitBreaker())
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = False
+            try:
+                probe = breaker.before_request()
+                result = await self._request(
+                    method,
+                    url,
+                    data,
+                    headers,
+                    conditional=conditional,
+                    decoder=decoder,
+                    metrics=metrics,
+                    client_timeout=client_timeout,
+                )
+            except SurfForecastIntegrationApiClientCommunicationError as exception:
+                retry_after = getattr(exception, "retry_after", None)
+                if isinstance(
+                    exception, SurfForecastIntegrationApiClientRateLimitError
+                ):
+                    self.stats["rate_limited"] += 1
+                if _is_retryable(exception):
+                    breaker.record_failure(retry_after)
+                elif not isinstance(
+                    exception, SurfForecastIntegrationApiClientCircuitOpenError
+                ):
+                    # The host answered, the request itself was at fault
+                    breaker.record_success()
+                delay = self._retry_delay(attempt, attempts, exception, retry_after)
+                if delay is None:
+                    self.stats["failures"] += 1
+                    if metrics is not None:
+                        metrics.count("failures")
+                    raise
+                self.stats["retries"] += 1
+                if metrics is not None:
+                    metrics.count("retries")
+                await asyncio.sleep(delay)
+                continue
+            except SurfForecastIntegrationApiClientError:
+                # The host answered, the request itself was at fault
+                breaker.record_success()
+                self.stats["failures"] += 1
+                if metrics is not None:
+                    metrics.count("failures")
+                raise
+            except BaseException:
+                # Cancelled: without an outcome, the probe must not hold the
+                # circuit half open forever
+                if probe:
+                    breaker.release_probe()
+                raise
+            breaker.record_success()
+            return result
+
+    async def _request(  # noqa: PLR0913
         self,
         method: str,
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+        *,
+        conditional: bool = False,
+        decoder: Callable[[bytes], Any] | None = None,
+        metrics: SpotMetrics | None = None,
+        client_timeout: aiohttp.ClientTimeout | None = None,
     ) -> Any:
-        """Get information from the API."""
+        """Perform a single request and map its failures to client errors."""
+        self.stats["requests"] += 1
+        if metrics is not None:
+            metrics.count("requests")
         try:
+            if conditional:
+                headers = {**(headers or {}), **self._conditional_headers(url)}
+            started = time.perf_counter()
             response = await self._session.request(
                 method=method,
                 url=url,
                 headers=headers,
                 json=data,
+                # Without a timeout of its own, the request keeps the session's
+                **({} if client_timeout is None else {"timeout": client_timeout}),
             )
+            if conditional and response.status == 304:  # noqa: PLR2004
+                response.release()
+                _record_response(metrics, "not_modified", started)
+                return None
             _verify_response_or_raise(response)
-            return await response.json()
-
+            body = await response.read()
+            # Forecast responses, the ones with a decoder, are polled again:
+            # their validators are kept from the first response on
+            validators = None
+            if conditional or decoder is not None:
+                validators = _validators(response, body)
+                if conditional and self._unchanged(url, validators):
+                    self._validators[url] = validators
+                    _record_response(metrics, "unchanged", started, body)
+                    return None
+            _record_response(metrics, "changed", started, body)
+            result = await _decode(body, decoder or json.loads, metrics)
+        except SurfForecastIntegrationApiClientError:
+            raise
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
             raise SurfForecastIntegrationApiClientCommunicationError(
@@ -134,3 +640,106 @@ class SurfForecastIntegrationApiClient:
             raise SurfForecastIntegrationApiClientError(
                 msg,
             ) from exception
+        else:
+            # Only a body that decoded may be revalidated against: a 304 to a
+            # broken one would keep the previous forecast until Surfline moves
+            if validators is not None:
+                self._validators[url] = validators
+            return result
+
+    @staticmethod
+    def _retry_delay(
+        attempt: int,
+        attempts: int,
+        exception: SurfForecastIntegrationApiClientCommunicationError,
+        retry_after: float | None,
+    ) -> float | None:
+        """Return how long to wait before the next attempt, or None to give up."""
+        if attempt >= attempts or not _is_retryable(exception):
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= MAX_RETRY_AFTER else None
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))  # noqa: S311
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return request counters and circuit breaker states."""
+        return {
+            **self.stats,
+            "circuit_breakers": {
+                host: breaker.as_dict() for host, breaker in self._breakers.items()
+            },
+        }
+
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        """Return the revalidation headers for a previously fetched URL."""
+        validators = self._validators.get(url, {})
+        headers = {}
+        if etag := validators.get("etag"):
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if last_modified := validators.get("last_modified"):
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        return headers
+
+    def _unchanged(self, url: str, validators: dict[str, str | None]) -> bool:
+        """
+        Return whether a response body matches the previous one for the URL.
+
+        The body digest covers servers that send no ETag or Last-Modified.
+        """
+        return self._validators.get(url, {}).get("digest") == validators["digest"]
+
+
+def _validators(response: aiohttp.ClientResponse, body: bytes) -> dict[str, str | None]:
+    """Return the revalidation state of a response: its validators and digest."""
+    return {
+        "etag": response.headers.get(hdrs.ETAG),
+        "last_modified": response.headers.get(hdrs.LAST_MODIFIED),
+        "digest": hashlib.blake2b(body, digest_size=16).hexdigest(),
+    }
+
+
+def _fail(future: asyncio.Future[Any], exception: Exception) -> None:
+    """Fail the callers sharing a request without logging unawaited errors."""
+    future.set_exception(exception)
+    # Mark the exception retrieved in case nobody else was waiting
+    future.exception()
+
+
+def _is_retryable(exception: Exception) -> bool:
+    """Return whether a failed request may succeed when tried again."""
+    if isinstance(exception, SurfForecastIntegrationApiClientCircuitOpenError):
+        return False
+    cause = exception.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        # Client errors other than rate limiting will not go away on retry
+        return cause.status >= 500  # noqa: PLR2004
+    return True
+
+
+def _record_response(
+    metrics: SpotMetrics | None,
+    outcome: str,
+    started: float,
+    body: bytes | None = None,
+) -> None:
+    """Record the latency, body size and outcome of a response."""
+    if metrics is None:
+        return
+    metrics.observe("request_ms", (time.perf_counter() - started) * 1000)
+    if body is not None:
+        metrics.observe("payload_bytes", len(body))
+    metrics.count(outcome)
+
+
+async def _decode(
+    body: bytes, decoder: Callable[[bytes], Any], metrics: SpotMetrics | None = None
+) -> Any:
+    """Decode a response body, in the executor when it is large."""
+    started = time.perf_counter()
+    if len(body) >= EXECUTOR_DECODE_THRESHOLD:
+        result = await asyncio.get_running_loop().run_in_executor(None, decoder, body)
+    else:
+        result = decoder(body)
+    if metrics is not None:
+        metrics.observe("decode_ms", (time.perf_counter() - started) * 1000)
+    return result
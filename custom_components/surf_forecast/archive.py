@@ -0,0 +1,315 @@
+"""Local archive of how the forecast of every spot evolved."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DEFAULT_ARCHIVE_DAYS, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from array import array
+    from datetime import datetime
+
+    from .models import ForecastTimeline
+
+ARCHIVE_FILE = f"{DOMAIN}.archive.db"
+DAY = 86400
+# Coalesce the snapshots of a whole refresh cycle into a single transaction
+FLUSH_DELAY = 30
+# Compaction runs at most once per interval and only touches changes issued
+# more than COMPACT_AFTER ago, keeping the last one per slot and bucket
+COMPACT_INTERVAL = DAY
+COMPACT_AFTER = 2 * DAY
+COMPACT_BUCKET = 6 * 3600
+
+_SCHEMA = (
+    # Must come before the tables are created for deleted pages to be returned
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    """CREATE TABLE IF NOT EXISTS spots (
+        id INTEGER PRIMARY KEY,
+        spot_id TEXT NOT NULL UNIQUE
+    )""",
+    # One narrow row per rating change, clustered by spot and slot so the
+    # history of a slot is a single range scan
+    """CREATE TABLE IF NOT EXISTS ratings (
+        spot INTEGER NOT NULL,
+        slot INTEGER NOT NULL,
+        issued_at INTEGER NOT NULL,
+        rating INTEGER NOT NULL,
+        PRIMARY KEY (spot, slot, issued_at)
+    ) WITHOUT ROWID""",
+)
+_INSERT = "INSERT OR REPLACE INTO ratings VALUES (?, ?, ?, ?)"
+# Last archived rating of every slot of a spot from a slot start on
+_LATEST = """
+    SELECT slot, rating, MAX(issued_at) FROM ratings
+    WHERE spot = ? AND slot >= ? GROUP BY slot
+"""
+# Keep the last change of each slot per bucket of issue times
+_THIN = """
+    DELETE FROM ratings WHERE (spot, slot, issued_at) IN (
+        SELECT spot, slot, issued_at FROM (
+            SELECT spot, slot, issued_at, ROW_NUMBER() OVER (
+                PARTITION BY spot, slot, issued_at / :bucket
+                ORDER BY issued_at DESC
+            ) AS newer
+            FROM ratings WHERE issued_at < :before
+        ) WHERE newer > 1
+    )
+"""
+# Drop the changes that thinning left equal to the one before them
+_REPEATS = """
+    DELETE FROM ratings WHERE (spot, slot, issued_at) IN (
+        SELECT spot, slot, issued_at FROM (
+            SELECT spot, slot, issued_at, rating, LAG(rating) OVER (
+                PARTITION BY spot, slot ORDER BY issued_at
+            ) AS previous
+            FROM ratings WHERE issued_at < :before
+        ) WHERE rating = previous
+    )
+"""
+
+type _Snapshot = tuple[str, int, array[int], array[int]]
+
+
+class SurfForecastArchive:
+    """
+    Keep every change of the slot ratings of every spot in a SQLite file.
+
+    A row is a spot, a slot start, when the forecast was fetched and the
+    rating index it gave the slot. A snapshot only adds rows for the slots
+    whose rating differs from the last archived one, so an unchanged forecast
+    costs nothing. Retention drops the slots older than the archive days, and
+    a daily compaction thins old changes to one per slot and COMPACT_BUCKET.
+
+    The database is only touched from the executor, one job at a time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        retention_days: int = DEFAULT_ARCHIVE_DAYS,
+        path: str | None = None,
+    ) -> None:
+        """Initialize the archive; the database is opened on first use."""
+        self.hass = hass
+        self.retention_days = retention_days
+        self._path = Path(path or hass.config.path(STORAGE_DIR, ARCHIVE_FILE))
+        self._connection: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+        # Snapshots waiting for the next flush, and the last one queued per spot
+        self._pending: list[_Snapshot] = []
+        self._last_queued: dict[str, tuple[array[int], array[int]]] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        # Executor side: spot row ids and the last archived rating of each slot
+        self._spot_ids: dict[str, int] = {}
+        self._latest: dict[int, dict[int, int]] = {}
+        self._compacted_at = 0.0
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    @callback
+    def async_add(
+        self, spot_id: str, timeline: ForecastTimeline, issued_at: datetime
+    ) -> None:
+        """Queue the ratings of a spot for archiving, unless they did not change."""
+        timestamps, ratings = timeline.timestamps, timeline.ratings
+        if self._last_queued.get(spot_id) == (timestamps, ratings):
+            return
+        self._last_queued[spot_id] = (timestamps, ratings)
+        self._pending.append((spot_id, int(issued_at.timestamp()), timestamps, ratings))
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def async_flush(self) -> None:
+        """Write the queued snapshots, compacting the archive when it is due."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        pending, self._pending = self._pending, []
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._write, pending, time.time())
+
+    async def async_history(
+        self, spot_id: str, at: float
+    ) -> tuple[int, list[tuple[int, int]]] | None:
+        """
+        Return the slot of a spot covering a time and how its rating evolved.
+
+        The history lists each rating the slot was given and when it was first
+        fetched, oldest first. None when the archive holds no such slot.
+        """
+        await self.async_flush()
+        async with self._lock:
+            return await self.hass.async_add_executor_job(
+                self._history, spot_id, int(at)
+            )
+
+    async def async_remove(self, spot_id: str) -> None:
+        """Forget the archived forecasts of a removed spot."""
+        self._pending = [
+            snapshot for snapshot in self._pending if snapshot[0] != spot_id
+        ]
+        self._last_queued.pop(spot_id, None)
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._remove, spot_id)
+
+    async def _async_scheduled_flush(self, _now: datetime) -> None:
+        """Flush once the delay after the first queued snapshot is over."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def _async_final_write(self, _event: Event) -> None:
+        """Flush the queued snapshots and close the database on shutdown."""
+        await self.async_flush()
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the database connection, creating the database if needed."""
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Jobs run one at a time, but not always on the same thread
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _write(self, pending: list[_Snapshot], now: float) -> None:
+        """Insert the changed ratings of the snapshots in one transaction."""
+        try:
+            connection = self._connect()
+            with connection:
+                for spot_id, issued_at, timestamps, ratings in pending:
+                    connection.executemany(
+                        _INSERT,
+                        self._changes(
+                            connection, spot_id, issued_at, timestamps, ratings
+                        ),
+                    )
+            if now - self._compacted_at >= COMPACT_INTERVAL:
+                self._compact(connection, now)
+                self._compacted_at = now
+        except sqlite3.Error as err:
+            # Reload the last archived ratings and the spot row ids from what
+            # was actually committed: spots added by the rolled back
+            # transaction have no row
+            self._latest.clear()
+            self._spot_ids.clear()
+            LOGGER.warning("Could not write the forecast archive: %s", err)
+
+    def _changes(
+        self,
+        connection: sqlite3.Connection,
+        spot_id: str,
+        issued_at: int,
+        timestamps: array[int],
+        ratings: array[int],
+    ) -> list[tuple[int, int, int, int]]:
+        """Return the rows of the slots whose rating changed since last archived."""
+        if not timestamps:
+            return []
+        spot = self._spot(connection, spot_id)
+        first = timestamps[0]
+        latest = self._latest.get(spot)
+        if latest is None:
+            latest = self._latest[spot] = {
+                slot: rating
+                for slot, rating, _ in connection.execute(_LATEST, (spot, first))
+            }
+        rows = [
+            (spot, slot, issued_at, rating)
+            for slot, rating in zip(timestamps, ratings, strict=True)
+            if latest.get(slot) != rating
+        ]
+        # Slots before the snapshot are settled and no longer compared
+        for slot in [slot for slot in latest if slot < first]:
+            del latest[slot]
+        latest.update((slot, rating) for _, slot, _, rating in rows)
+        return rows
+
+    def _spot(self, connection: sqlite3.Connection, spot_id: str) -> int:
+        """Return the row id of a spot, adding the spot if needed."""
+        if (spot := self._spot_ids.get(spot_id)) is None:
+            connection.execute(
+                "INSERT OR IGNORE INTO spots (spot_id) VALUES (?)", (spot_id,)
+            )
+            (spot,) = connection.execute(
+                "SELECT id FROM spots WHERE spot_id = ?", (spot_id,)
+            ).fetchone()
+            self._spot_ids[spot_id] = spot
+        return spot
+
+    def _compact(self, connection: sqlite3.Connection, now: float) -> None:
+        """Apply the retention, thin old changes and return the freed pages."""
+        before = int(now - COMPACT_AFTER)
+        with connection:
+            connection.execute(
+                "DELETE FROM ratings WHERE slot < ?",
+                (int(now - self.retention_days * DAY),),
+            )
+            connection.execute(_THIN, {"bucket": COMPACT_BUCKET, "before": before})
+            connection.execute(_REPEATS, {"before": before})
+        connection.execute("PRAGMA incremental_vacuum")
+
+    def _history(
+        self, spot_id: str, at: int
+    ) -> tuple[int, list[tuple[int, int]]] | None:
+        """Look up the slot covering a time and its rating changes."""
+        connection = self._connect()
+        if (row := self._find_spot(connection, spot_id)) is None:
+            return None
+        (spot,) = row
+        row = connection.execute(
+            "SELECT slot FROM ratings WHERE spot = ? AND slot > ? AND slot <= ?"
+            " ORDER BY slot DESC LIMIT 1",
+            (spot, at - DAY, at),
+        ).fetchone()
+        if row is None:
+            return None
+        (slot,) = row
+        history = connection.execute(
+            "SELECT issued_at, rating FROM ratings WHERE spot = ? AND slot = ?"
+            " ORDER BY issued_at",
+            (spot, slot),
+        ).fetchall()
+        return slot, history
+
+    def _remove(self, spot_id: str) -> None:
+        """Delete the rows of a spot."""
+        connection = self._connect()
+        if (row := self._find_spot(connection, spot_id)) is None:
+            return
+        (spot,) = row
+        with connection:
+            connection.execute("DELETE FROM ratings WHERE spot = ?", (spot,))
+            connection.execute("DELETE FROM spots WHERE id = ?", (spot,))
+        self._spot_ids.pop(spot_id, None)
+        self._latest.pop(spot, None)
+
+    @staticmethod
+    def _find_spot(connection: sqlite3.Connection, spot_id: str) -> tuple[int] | None:
+        """Return the row of a spot, without adding it."""
+        return connection.execute(
+            "SELECT id FROM spots WHERE spot_id = ?", (spot_id,)
+        ).fetchone()
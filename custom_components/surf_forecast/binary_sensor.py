@@ -5,15 +5,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import slugify
 
-from .const import DOMAIN, SURFLINE_RATING_LEVELS
+from .const import DOMAIN
+from .entity import SurfForecastCoordinatorEntity, update_property
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
     from .data import SurfForecastIntegrationConfigEntry
 
@@ -28,7 +27,7 @@ async def async_setup_entry(
     async_add_entities([SurflineConditionBinarySensor(coordinator, entry)])
 
 
-class SurflineConditionBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class SurflineConditionBinarySensor(SurfForecastCoordinatorEntity, BinarySensorEntity):
     """Binary sensor that is on if any forecasted rating meets the selected."""
 
     @property
@@ -36,30 +35,6 @@ class SurflineConditionBinarySensor(CoordinatorEntity, BinarySensorEntity):
         """Return a surfing icon if on, bed icon if off."""
         return "mdi:surfing" if self.is_on else "mdi:bed"
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to select entity state changes and coordinator updates."""
-        await super().async_added_to_hass()
-        # Listen for select changes
-        spot_slug = slugify(self.config_entry.title)
-        select_entity_id = f"select.{spot_slug}_minimum_surf_rating"
-        rating_entity_id = f"sensor.{spot_slug}_surf_rating"
-
-        async def _handle_related_change(event: object) -> None:  # noqa: ARG001
-            self.async_write_ha_state()
-
-        # Listen for changes to the select entity
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, select_entity_id, _handle_related_change
-            )
-        )
-        # Listen for changes to the rating sensor entity
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, rating_entity_id, _handle_related_change
-            )
-        )
-
     """
     Binary sensor that is on if any forecasted rating meets or exceeds the selected.
     minimum rating.
@@ -81,34 +56,7 @@ class SurflineConditionBinarySensor(CoordinatorEntity, BinarySensorEntity):
             "model": "Surf Forecast",
         }
 
-    @property
+    @update_property
     def is_on(self) -> bool:
-        """Return true if any forecasted rating is >= the selected minimum rating."""
-        hass = self.coordinator.hass
-        # Slugify the config entry title to match Home Assistant's entity_id pattern
-        spot_slug = slugify(self.config_entry.title)
-
-        # Get the select entity state for minimum rating
-        select_entity_id = f"select.{spot_slug}_minimum_surf_rating"
-        select_state = hass.states.get(select_entity_id)
-        min_rating = select_state.state if select_state else None
-
-        # Get the sensor entity state for forecasted ratings
-        sensor_entity_id = f"sensor.{spot_slug}_surf_rating"
-        sensor_state = hass.states.get(sensor_entity_id)
-        forecast = sensor_state.attributes.get("forecast") if sensor_state else None
-
-        if (
-            not min_rating
-            or min_rating == "unavailable"
-            or min_rating not in SURFLINE_RATING_LEVELS
-            or not forecast
-        ):
-            return False
-        min_index = SURFLINE_RATING_LEVELS.index(min_rating)
-        # Iterate over all forecasted values in the attributes
-        for rating in forecast:
-            key = rating["rating"].get("key")
-            if key and SURFLINE_RATING_LEVELS.index(key) >= min_index:
-                return True
-        return False
+        """Return true if any upcoming rating is >= the selected minimum rating."""
+        return self.coordinator.next_qualifying_timestamp() is not None
@@ -6,22 +6,38 @@ from typing import TYPE_CHECKING
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.const import UnitOfLength
+from homeassistant.core import callback
+from homeassistant.helpers import selector
 
-if TYPE_CHECKING:
-    from aiohttp import ClientSession
-
-from .api import (
-    SurfForecastIntegrationApiClient,
+from .const import (
+    CONF_FORECAST_ATTRIBUTES,
+    CONF_FORECAST_DAYS,
+    CONF_FORECAST_HOURS,
+    CONF_FORECAST_INTERVAL,
+    CONF_MAX_SNAPSHOT_AGE,
+    CONF_WINDOW_DAYLIGHT,
+    CONF_WINDOW_HOURS,
+    DEFAULT_FORECAST_ATTRIBUTES,
+    DEFAULT_FORECAST_DAYS,
+    DEFAULT_FORECAST_HOURS,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_MAX_SNAPSHOT_AGE,
+    DEFAULT_WINDOW_DAYLIGHT,
+    DEFAULT_WINDOW_HOURS,
+    DOMAIN,
+    FORECAST_ATTRIBUTES_MODES,
+    FORECAST_INTERVALS,
+    MAX_FORECAST_DAYS,
 )
-from .const import DOMAIN
+from .search import async_get_spot_search
+from .spatial import async_get_spot_index
 
+if TYPE_CHECKING:
+    from .spatial import SpotIndex
 
-async def async_search_spots(session: ClientSession, spot_query: str):  # noqa: ANN201
-    """Search for surf spots matching the query."""
-    return await SurfForecastIntegrationApiClient(session=session).async_search_spots(
-        spot_query
-    )
+# How many of the nearest indexed spots the nearby step proposes
+NEARBY_SPOT_COUNT = 10
 
 
 class SurfForecastFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -29,17 +45,38 @@ class SurfForecastFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> SurfForecastOptionsFlow:
+        """Return the options flow for this handler."""
+        return SurfForecastOptionsFlow()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
     ) -> config_entries.ConfigFlowResult:
-        """Handle a flow initialized by the user."""
+        """Offer spots near home when some are known, otherwise search."""
+        spot_index = await async_get_spot_index(self.hass)
+        # Spots configured before the index existed are worth proposing later
+        spot_index.async_add(entry.data for entry in self._async_current_entries())
+        if self._nearby_spots(spot_index):
+            return self.async_show_menu(
+                step_id="user", menu_options=["search", "nearby"]
+            )
+        return await self.async_step_search(user_input)
+
+    async def async_step_search(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Handle a search of surf spots by name."""
         errors = {}
         if user_input is not None:
             spot_query = user_input["spot_query"]
-            session = async_create_clientsession(self.hass)
             try:
-                spots = await async_search_spots(session, spot_query)
+                spots = await async_get_spot_search(self.hass).async_search(spot_query)
             except (
                 Exception  # noqa: BLE001
             ):  # Replace with specific exception if possible
@@ -48,6 +85,7 @@ class SurfForecastFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not spots:
                 errors["base"] = "no_spots_found"
             else:
+                (await async_get_spot_index(self.hass)).async_add(spots)
                 # Check if any of the found spots is already configured
                 existing_spot_ids = {
                     entry.data.get("spot_id") for entry in self._async_current_entries()
@@ -61,11 +99,44 @@ class SurfForecastFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     self.spot_search_results = filtered_spots
                     return await self.async_step_select_spot()
         return self.async_show_form(
-            step_id="user",
+            step_id="search",
             data_schema=vol.Schema({vol.Required("spot_query"): str}),
             errors=errors,
         )
 
+    async def async_step_nearby(
+        self, user_input: dict | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Propose the indexed spots nearest to home, ranked by distance."""
+        if user_input is not None:
+            return await self.async_step_select_spot(user_input)
+        nearby = self._nearby_spots(await async_get_spot_index(self.hass))
+        self.spot_search_results = [spot for _, spot in nearby]
+        length = self.hass.config.units.length
+        spot_options = {
+            spot["spot_id"]: (
+                f"{spot['name']} ({spot['city']}) - "
+                f"{length(distance, UnitOfLength.KILOMETERS):.1f} {length.unit}"
+            )
+            for distance, spot in nearby
+        }
+        return self.async_show_form(
+            step_id="nearby",
+            data_schema=vol.Schema({vol.Required("spot_id"): vol.In(spot_options)}),
+        )
+
+    def _nearby_spots(self, spot_index: SpotIndex) -> list[tuple[float, dict]]:
+        """Return the unconfigured indexed spots nearest to home with distances."""
+        existing_spot_ids = {
+            entry.data.get("spot_id") for entry in self._async_current_entries()
+        }
+        return spot_index.nearest(
+            self.hass.config.latitude,
+            self.hass.config.longitude,
+            NEARBY_SPOT_COUNT,
+            exclude=existing_spot_ids,
+        )
+
     async def async_step_select_spot(
         self, user_input: dict | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -110,3 +181,119 @@ class SurfForecastFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             description_placeholders={"spot_count": str(len(spots))},
         )
+
+
+class SurfForecastOptionsFlow(config_entries.OptionsFlow):
+    """Options flow."""
+
+    async def async_step_init(
+        self, user_input: dict | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the fetched forecast, its attributes, snapshots and windows."""
+        options = self.config_entry.options
+        if user_input is not None:
+            # Keep options managed elsewhere, such as the minimum surf rating
+            return self.async_create_entry(data={**options, **user_input})
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FORECAST_DAYS,
+                        default=options.get(CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=MAX_FORECAST_DAYS,
+                                unit_of_measurement="d",
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_FORECAST_INTERVAL,
+                        default=str(
+                            options.get(
+                                CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL
+                            )
+                        ),
+                    ): vol.All(
+                        selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[
+                                    str(interval) for interval in FORECAST_INTERVALS
+                                ],
+                                mode=selector.SelectSelectorMode.DROPDOWN,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_FORECAST_ATTRIBUTES,
+                        default=options.get(
+                            CONF_FORECAST_ATTRIBUTES, DEFAULT_FORECAST_ATTRIBUTES
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=FORECAST_ATTRIBUTES_MODES,
+                            translation_key=CONF_FORECAST_ATTRIBUTES,
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_FORECAST_HOURS,
+                        default=options.get(
+                            CONF_FORECAST_HOURS, DEFAULT_FORECAST_HOURS
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=384,
+                                unit_of_measurement="h",
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_MAX_SNAPSHOT_AGE,
+                        default=options.get(
+                            CONF_MAX_SNAPSHOT_AGE, DEFAULT_MAX_SNAPSHOT_AGE
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=168,
+                                unit_of_measurement="h",
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_WINDOW_HOURS,
+                        default=options.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=24,
+                                unit_of_measurement="h",
+                                mode=selector.NumberSelectorMode.BOX,
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_WINDOW_DAYLIGHT,
+                        default=options.get(
+                            CONF_WINDOW_DAYLIGHT, DEFAULT_WINDOW_DAYLIGHT
+                        ),
+                    ): selector.BooleanSelector(),
+                }
+            ),
+        )
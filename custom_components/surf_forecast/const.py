@@ -1,5 +1,6 @@
 """Constants for surf_forecast."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
@@ -7,6 +8,95 @@ LOGGER: Logger = getLogger(__package__)
 DOMAIN = "surf_forecast"
 ATTRIBUTION = "Data provided by https://surfline.com"
 
+# Adaptive refresh schedule shared by every configured spot
+UPDATE_INTERVAL = timedelta(hours=1)
+# Floor while a slot at or above the minimum rating is close
+MIN_UPDATE_INTERVAL = timedelta(minutes=30)
+NEAR_SURF_WINDOW = timedelta(hours=12)
+# Ceiling reached by backing off on identical payloads
+MAX_UPDATE_INTERVAL = timedelta(hours=6)
+# Random spread applied to every interval, as a fraction of it
+UPDATE_JITTER = 0.1
+# Spots due within this window are refreshed in the same burst
+BATCH_WINDOW = timedelta(minutes=5)
+# Surfline requests allowed per rolling day for all spots together
+CONF_DAILY_REQUEST_BUDGET = "daily_request_budget"
+DEFAULT_DAILY_REQUEST_BUDGET = 1000
+
+# Upper bound of simultaneous Surfline requests during a refresh cycle
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Hours ahead the best spot of all configured spots is looked for
+CONF_BEST_SPOT_HOURS = "best_spot_hours"
+DEFAULT_BEST_SPOT_HOURS = 24
+
+# Days the forecast archive keeps past slots and how their history evolved
+CONF_ARCHIVE_DAYS = "archive_days"
+DEFAULT_ARCHIVE_DAYS = 30
+
+# Minimum surf rating chosen through the select entity
+CONF_MIN_SURF_RATING = "min_surf_rating"
+
+# How much of the forecast the rating sensor exposes as state attributes
+CONF_FORECAST_ATTRIBUTES = "forecast_attributes"
+FORECAST_ATTRIBUTES_NONE = "none"
+FORECAST_ATTRIBUTES_NEXT_HOURS = "next_hours"
+FORECAST_ATTRIBUTES_COMPACT = "compact"
+# Every slot of the forecast, the attribute shape of earlier releases
+FORECAST_ATTRIBUTES_FULL = "full"
+FORECAST_ATTRIBUTES_MODES = [
+    FORECAST_ATTRIBUTES_NONE,
+    FORECAST_ATTRIBUTES_NEXT_HOURS,
+    FORECAST_ATTRIBUTES_COMPACT,
+    FORECAST_ATTRIBUTES_FULL,
+]
+DEFAULT_FORECAST_ATTRIBUTES = FORECAST_ATTRIBUTES_FULL
+CONF_FORECAST_HOURS = "forecast_hours"
+DEFAULT_FORECAST_HOURS = 24
+
+# Oldest stored forecast snapshot still shown while Surfline is revalidated
+CONF_MAX_SNAPSHOT_AGE = "max_snapshot_age"
+DEFAULT_MAX_SNAPSHOT_AGE = 24  # hours
+
+# Forecast horizon and slot resolution fetched from Surfline
+CONF_FORECAST_DAYS = "forecast_days"
+DEFAULT_FORECAST_DAYS = 5
+MAX_FORECAST_DAYS = 16
+CONF_FORECAST_INTERVAL = "forecast_interval"
+DEFAULT_FORECAST_INTERVAL = 1  # hours
+FORECAST_INTERVALS = [1, 3, 6]
+# Most refreshes only fetch the near days and splice them into the stored
+# forecast; the whole horizon is fetched again once the tail is this old
+NEAR_FORECAST_DAYS = 2
+TAIL_REFRESH_INTERVAL = timedelta(hours=6)
+# Surfline endpoints fetched alongside the ratings, and how long the values of
+# each stay fresh. Tides are astronomical and barely move between model runs.
+CONDITION_TTLS = {
+    "wave": timedelta(hours=1),
+    "wind": timedelta(hours=1),
+    "swells": timedelta(hours=3),
+    "tides": timedelta(hours=24),
+}
+
+# Surf windows: runs of consecutive slots at or above the minimum rating
+CONF_WINDOW_HOURS = "window_hours"
+DEFAULT_WINDOW_HOURS = 3
+CONF_WINDOW_DAYLIGHT = "window_daylight"
+DEFAULT_WINDOW_DAYLIGHT = True
+
+# Options applied in place from cached data; any other change reloads the entry
+LIVE_OPTIONS = frozenset(
+    {
+        CONF_MIN_SURF_RATING,
+        CONF_FORECAST_ATTRIBUTES,
+        CONF_FORECAST_HOURS,
+        CONF_MAX_SNAPSHOT_AGE,
+        CONF_WINDOW_HOURS,
+        CONF_WINDOW_DAYLIGHT,
+    }
+)
+
 # Mapping of Surfline rating keys to Material Design Icons
 SURFLINE_RATING_KEY_TO_ICON = {
     "POOR": "mdi:weather-cloudy",
@@ -2,27 +2,49 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import math
+import time
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
-    SurfForecastIntegrationApiClient,
     SurfForecastIntegrationApiClientAuthenticationError,
     SurfForecastIntegrationApiClientError,
 )
+from .const import (
+    CONF_FORECAST_DAYS,
+    CONF_FORECAST_INTERVAL,
+    CONF_MIN_SURF_RATING,
+    CONF_WINDOW_DAYLIGHT,
+    CONF_WINDOW_HOURS,
+    DEFAULT_FORECAST_DAYS,
+    DEFAULT_FORECAST_INTERVAL,
+    DEFAULT_WINDOW_DAYLIGHT,
+    DEFAULT_WINDOW_HOURS,
+    LIVE_OPTIONS,
+    NEAR_FORECAST_DAYS,
+    SURFLINE_RATING_LEVELS,
+    TAIL_REFRESH_INTERVAL,
+)
+from .metrics import SpotMetrics
+from .models import RATING_INDEX, ForecastTimeline
+from .windows import SurfWindow, find_windows
 
 if TYPE_CHECKING:
     from logging import Logger
 
     from .data import SurfForecastIntegrationConfigEntry
+    from .hub import SurfForecastHub
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class SurfForecastDataUpdateCoordinator(DataUpdateCoordinator):
+class SurfForecastDataUpdateCoordinator(DataUpdateCoordinator[ForecastTimeline]):
     """Class to manage fetching data from the API."""
 
     config_entry: SurfForecastIntegrationConfigEntry
@@ -33,24 +55,206 @@ class SurfForecastDataUpdateCoordinator(DataUpdateCoordinator):
         logger: Logger,
         name: str,
         config_entry: SurfForecastIntegrationConfigEntry,
+        hub: SurfForecastHub,
     ) -> None:
-        """Initialize the SurfForecastDataUpdateCoordinator with 1h polling."""
+        """
+        Initialize the SurfForecastDataUpdateCoordinator.
+
+        The coordinator has no timer of its own: the shared hub refreshes every
+        registered spot in one cycle.
+        """
         super().__init__(
             hass,
             logger=logger,
             name=name,
-            update_interval=timedelta(hours=1),
+            update_interval=None,
             config_entry=config_entry,
+            # Entities are only written when the parsed forecast changed
+            always_update=False,
         )
         self.config_entry = config_entry
+        self.hub = hub
+        # When the forecast currently held in data was fetched from Surfline
+        self.forecast_fetched_at: datetime | None = None
+        # Told about every fetch, including those leaving the forecast as it was
+        self._fetch_listeners: list[CALLBACK_TYPE] = []
+        # Whether the last successful refresh returned a different payload
+        self.forecast_changed = True
+        # When the whole horizon was last fetched, in perf_counter seconds
+        self._tail_fetched_at: float | None = None
+        # Single timer waking the entities up at the next slot start
+        self._unsub_slot_boundary: CALLBACK_TYPE | None = None
+        # Request, decode and state write metrics of this spot
+        self.metrics = SpotMetrics()
+        self._live_options = self._current_live_options()
+
+    @property
+    def min_rating(self) -> str:
+        """Return the minimum surf rating chosen for this spot."""
+        min_rating = self.config_entry.options.get(CONF_MIN_SURF_RATING)
+        return min_rating if min_rating in RATING_INDEX else SURFLINE_RATING_LEVELS[0]
+
+    @callback
+    def async_add_fetch_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """
+        Listen for every forecast fetched, whether or not it changed.
+
+        Coordinator listeners are only called when the forecast changed, so
+        whatever shows when the forecast was fetched listens here instead.
+        """
+        self._fetch_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._fetch_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify_fetch(self, fetched_at: datetime) -> None:
+        """Record when the forecast was fetched and tell the fetch listeners."""
+        self.forecast_fetched_at = fetched_at
+        for update_callback in list(self._fetch_listeners):
+            update_callback()
+
+    def next_qualifying_timestamp(self) -> int | None:
+        """Return the first upcoming slot start rated at or above the minimum."""
+        if not self.data:
+            return None
+        return self.data.first_timestamp_at_or_above(
+            RATING_INDEX[self.min_rating], datetime.now(UTC).timestamp()
+        )
+
+    def find_windows(  # noqa: PLR0913
+        self,
+        *,
+        min_rating: str | None = None,
+        min_hours: float | None = None,
+        daylight: bool | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int | None = None,
+    ) -> list[SurfWindow]:
+        """
+        Return the upcoming surf windows of the spot.
+
+        Unset criteria default to the minimum rating and window options of the
+        spot, and the range to the rest of the fetched forecast. Daylight is
+        computed at the spot location, or at home when Surfline gave none.
+        """
+        if not self.data:
+            return []
+        options = self.config_entry.options
+        if daylight is None:
+            daylight = options.get(CONF_WINDOW_DAYLIGHT, DEFAULT_WINDOW_DAYLIGHT)
+        location = self.data.location or {}
+        return find_windows(
+            self.data,
+            RATING_INDEX[min_rating or self.min_rating],
+            min_hours or options.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS),
+            start=time.time() if start is None else start,
+            end=math.inf if end is None else end,
+            # The data says its resolution, even when the options moved on
+            slot_seconds=self.data.slot_seconds()
+            or options.get(CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL) * 3600,
+            daylight_at=(
+                (
+                    location.get("lat", self.hass.config.latitude),
+                    location.get("lon", self.hass.config.longitude),
+                )
+                if daylight
+                else None
+            ),
+            limit=limit,
+        )
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
+    @callback
+    def async_apply_live_options(self) -> None:
+        """Recompute entities from cached data when a live option changed."""
+        live_options = self._current_live_options()
+        if live_options == self._live_options:
+            return
+        self._live_options = live_options
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and re-arm the slot boundary timer."""
+        super().async_update_listeners()
+        self._async_schedule_slot_boundary()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the slot boundary timer and any scheduled refresh."""
+        self._async_cancel_slot_boundary()
+        await super().async_shutdown()
+
+    @callback
+    def _async_schedule_slot_boundary(self) -> None:
+        """
+        Arm one timer at the next slot start after now.
+
+        The current rating, the first qualifying date and the forecast window
+        all move on when a slot starts, so entities are re-evaluated exactly
+        then instead of waiting for the next poll.
+        """
+        self._async_cancel_slot_boundary()
+        if not self.data:
+            return
+        timestamps = self.data.timestamps
+        now = time.time()
+        index = self.data.index_at(now)
+        if index < len(timestamps) and timestamps[index] <= now:
+            index += 1
+        if index >= len(timestamps):
+            return
+        self._unsub_slot_boundary = async_track_point_in_utc_time(
+            self.hass,
+            self._async_handle_slot_boundary,
+            dt_util.utc_from_timestamp(timestamps[index]),
+        )
+
+    @callback
+    def _async_handle_slot_boundary(self, _now: datetime) -> None:
+        """Re-evaluate the entities when a slot starts."""
+        self._unsub_slot_boundary = None
+        # Re-arms the timer for the following slot
+        self.async_update_listeners()
+
+    @callback
+    def _async_cancel_slot_boundary(self) -> None:
+        """Cancel the pending slot boundary timer."""
+        if self._unsub_slot_boundary is not None:
+            self._unsub_slot_boundary()
+            self._unsub_slot_boundary = None
+
+    def _current_live_options(self) -> dict[str, Any]:
+        """Return the current values of the options applied without reload."""
+        options = self.config_entry.options
+        return {key: options.get(key) for key in LIVE_OPTIONS}
+
+    async def _async_update_data(self) -> ForecastTimeline:
+        """Fetch the spot ratings and conditions, merged into one timeline."""
+        started = time.perf_counter()
+        options = self.config_entry.options
+        days = options.get(CONF_FORECAST_DAYS, DEFAULT_FORECAST_DAYS)
+        full = (
+            self.data is None
+            or days <= NEAR_FORECAST_DAYS
+            or self._tail_fetched_at is None
+            or started - self._tail_fetched_at >= TAIL_REFRESH_INTERVAL.total_seconds()
+        )
+        interval_hours = options.get(CONF_FORECAST_INTERVAL, DEFAULT_FORECAST_INTERVAL)
+        spot_id = self.config_entry.data["spot_id"]
         try:
-            session = async_get_clientsession(self.hass)
-            spot_id = self.config_entry.data["spot_id"]
-            client = SurfForecastIntegrationApiClient(session)
-            return await client.async_get_ratings(spot_id)
+            # Revalidate only when there is a parsed forecast to fall back to
+            timeline = await self.hub.async_fetch_forecast(
+                spot_id,
+                days=days,
+                interval_hours=interval_hours,
+                ratings_days=days if full else NEAR_FORECAST_DAYS,
+                conditional=self.data is not None,
+                metrics=self.metrics,
+            )
         except SurfForecastIntegrationApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except SurfForecastIntegrationApiClientError as exception:
@@ -59,3 +263,36 @@ class SurfForecastDataUpdateCoordinator(DataUpdateCoordinator):
             # Catch network-related errors (socket, aiohttp, etc.)
             msg = "Error fetching Surfline data: network or system error"
             raise UpdateFailed(msg) from err
+        finally:
+            self.metrics.observe("refresh_ms", (time.perf_counter() - started) * 1000)
+        if full:
+            self._tail_fetched_at = started
+        if timeline is None:
+            # Unchanged since the last poll: keep the parsed forecast as is
+            timeline = self.data
+        elif not full:
+            # Splice the fresh near days in front of the stored tail
+            timeline = self.data.merged(timeline)
+        # Conditions may have changed even when the ratings did not
+        timeline = timeline.with_conditions(
+            self.hub.conditions(spot_id, days=days, interval_hours=interval_hours)
+        )
+        self.forecast_changed = timeline != self.data
+        self._async_notify_fetch(dt_util.utcnow())
+        self.hub.snapshots.async_save(
+            spot_id,
+            timeline,
+            self.forecast_fetched_at,
+            days=days,
+            interval_hours=interval_hours,
+        )
+        self.hub.archive.async_add(spot_id, timeline, self.forecast_fetched_at)
+        return timeline
+
+    @callback
+    def async_set_snapshot(
+        self, timeline: ForecastTimeline, fetched_at: datetime
+    ) -> None:
+        """Serve a stored forecast until the next successful refresh."""
+        self._async_notify_fetch(fetched_at)
+        self.async_set_updated_data(timeline)
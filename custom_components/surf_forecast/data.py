@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
     from .api import SurfForecastIntegrationApiClient
     from .coordinator import SurfForecastDataUpdateCoordinator
+    from .hub import SurfForecastHub
 
 type SurfForecastIntegrationConfigEntry = ConfigEntry["SurfForecastIntegrationData"]
 
@@ -21,4 +22,7 @@ class SurfForecastIntegrationData:
 
     client: SurfForecastIntegrationApiClient
     coordinator: SurfForecastDataUpdateCoordinator
+    hub: SurfForecastHub
     integration: Integration
+    # Entry data and non-live options the platforms were set up with
+    reload_options: dict[str, Any] = field(default_factory=dict)
@@ -7,18 +7,23 @@ from typing import TYPE_CHECKING
 from homeassistant.helpers import diagnostics
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
+    from .data import SurfForecastIntegrationConfigEntry
+
 TO_REDACT = ["api_key", "password"]
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant,  # noqa: ARG001
-    entry: ConfigEntry,
+    entry: SurfForecastIntegrationConfigEntry,
 ) -> dict:
     """Return diagnostics for a config entry."""
     return {
         "entry_data": diagnostics.async_redact_data(entry.data, TO_REDACT),
         "options": diagnostics.async_redact_data(entry.options, TO_REDACT),
+        # Counters and circuit breakers of the API client shared by all spots
+        "api": entry.runtime_data.client.diagnostics(),
+        # Latency, size, decode and state write metrics of this spot
+        "metrics": entry.runtime_data.coordinator.metrics.as_dict(),
     }
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION, DOMAIN
 from .coordinator import SurfForecastDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class SurfForecastIntegrationEntity(
     CoordinatorEntity[SurfForecastDataUpdateCoordinator]
@@ -27,3 +34,64 @@ class SurfForecastIntegrationEntity(
             "model": "Surf forecast",
         }
         self._attr_has_entity_name = True
+
+
+def update_property(func: Callable[[Any], Any]) -> property:
+    """
+    Return a property computed at most once per coordinator update.
+
+    While SurfForecastCoordinatorEntity handles an update, the value is kept
+    for the state comparison and the state write that follows it; outside of
+    an update it is computed on every read.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self: SurfForecastCoordinatorEntity) -> Any:
+        memo = self._update_memo
+        if memo is None:
+            return func(self)
+        if name not in memo:
+            memo[name] = func(self)
+        return memo[name]
+
+    return property(getter)
+
+
+class SurfForecastCoordinatorEntity(
+    CoordinatorEntity[SurfForecastDataUpdateCoordinator]
+):
+    """
+    Coordinator entity that only writes its state when it changed.
+
+    A coordinator update notifies every entity of the spot, but most updates
+    leave most entities as they were: a new forecast rarely moves the first
+    qualifying date, and a new minimum rating does not change the rating.
+    Properties declared with update_property are computed once per update,
+    for both the comparison and the write.
+    """
+
+    _last_written: tuple[Any, ...] | None = None
+    _update_memo: dict[str, Any] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when it differs from the last written one."""
+        # Counted here, not by the coordinator: the hub ranking also listens
+        self.coordinator.metrics.count("listener_updates")
+        self._update_memo = {}
+        try:
+            written = (
+                self.available,
+                self.state,
+                self.icon,
+                self.extra_state_attributes,
+            )
+            if written == self._last_written:
+                self.coordinator.metrics.count("skipped_writes")
+                return
+            self._last_written = written
+            self.coordinator.metrics.count_state_writes(1)
+            self.async_write_ha_state()
+        finally:
+            self._update_memo = None
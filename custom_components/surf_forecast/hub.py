@@ -0,0 +1,297 @@
+"""Domain-level hub that refreshes every configured surf spot in one cycle."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .api import SurfForecastIntegrationApiClient
+from .archive import SurfForecastArchive
+from .const import (
+    DEFAULT_ARCHIVE_DAYS,
+    DEFAULT_BEST_SPOT_HOURS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    LOGGER,
+)
+from .metrics import SpotMetrics
+from .ranking import SpotRanking
+from .scheduler import AdaptivePollScheduler
+from .snapshot import SurfForecastSnapshotStore
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+    from typing import Any
+
+    from .coordinator import SurfForecastDataUpdateCoordinator
+    from .models import ConditionSeries, ForecastTimeline
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> SurfForecastHub:
+    """
+    Return the hub of this Home Assistant instance.
+
+    A config flow may search spots before the integration was set up; it gets
+    a hub with the default settings, whose client setup then takes over.
+    """
+    if (hub := hass.data.get(DOMAIN)) is None:
+        hub = hass.data[DOMAIN] = SurfForecastHub(
+            hass,
+            client=SurfForecastIntegrationApiClient(
+                session=async_get_clientsession(hass),
+            ),
+        )
+    return hub
+
+
+class SurfForecastHub:
+    """
+    Own the shared API client and refresh all spots on a single schedule.
+
+    Every config entry registers its coordinator here instead of running its own
+    timer, so N spots cost one scheduled task and a bounded burst of requests.
+    The adaptive scheduler decides when each spot is due; the hub keeps a single
+    timer armed at the earliest due time.
+
+    The hub also ranks the spots by their rating now and their best rating in
+    the next hours. Each coordinator update re-scores only its own spot.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        client: SurfForecastIntegrationApiClient,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        scheduler: AdaptivePollScheduler | None = None,
+        best_spot_hours: int = DEFAULT_BEST_SPOT_HOURS,
+        archive_days: int = DEFAULT_ARCHIVE_DAYS,
+    ) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.client = client
+        self.scheduler = scheduler or AdaptivePollScheduler()
+        self.snapshots = SurfForecastSnapshotStore(hass)
+        self.archive = SurfForecastArchive(hass, archive_days)
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._coordinators: dict[str, SurfForecastDataUpdateCoordinator] = {}
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        # Spots of the refresh cycle in progress; the timer is re-armed after it
+        self._refreshing: set[str] = set()
+        # Spots ranked by the rating now, and by the best rating ahead
+        self.best_spot_hours = best_spot_hours
+        self.best_now = SpotRanking()
+        self.best_next = SpotRanking()
+        self._ranking_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_register(
+        self, coordinator: SurfForecastDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Add a spot coordinator to the refresh cycle and return an unregister."""
+        entry_id = coordinator.config_entry.entry_id
+        self._coordinators[entry_id] = coordinator
+        self.scheduler.add(entry_id, time.time())
+        self._async_schedule_refresh()
+        unsub_rank = coordinator.async_add_listener(partial(self._async_rank, entry_id))
+        self._async_rank(entry_id)
+
+        @callback
+        def _async_unregister() -> None:
+            unsub_rank()
+            self._coordinators.pop(entry_id, None)
+            self.scheduler.remove(entry_id)
+            self._async_schedule_refresh()
+            self._async_rank(entry_id)
+
+        return _async_unregister
+
+    @callback
+    def async_add_ranking_listener(self, update: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call update whenever a spot was re-ranked; return a remove callback."""
+        self._ranking_listeners.append(update)
+
+        @callback
+        def _async_remove() -> None:
+            self._ranking_listeners.remove(update)
+
+        return _async_remove
+
+    def coordinator(self, entry_id: str) -> SurfForecastDataUpdateCoordinator | None:
+        """Return the coordinator of a registered spot."""
+        return self._coordinators.get(entry_id)
+
+    @callback
+    def _async_rank(self, entry_id: str) -> None:
+        """
+        Re-score a single spot in both rankings.
+
+        Scores are the rating index, higher is better; the best spot ahead
+        ranks earlier slots first. Coordinators update their listeners at every
+        slot start, so the scores follow the clock without a timer of their own.
+        """
+        coordinator = self._coordinators.get(entry_id)
+        timeline = coordinator.data if coordinator is not None else None
+        now_score = next_score = None
+        if timeline:
+            now = time.time()
+            index = timeline.index_at(now)
+            if index < len(timeline) and (rating := timeline.ratings[index]) >= 0:
+                now_score = (rating,)
+            best = timeline.best_index(now, now + self.best_spot_hours * 3600)
+            if best is not None:
+                next_score = (timeline.ratings[best], -timeline.timestamps[best])
+        self.best_now.update(entry_id, now_score)
+        self.best_next.update(entry_id, next_score)
+        for update in self._ranking_listeners:
+            update()
+
+    async def async_fetch_forecast(  # noqa: PLR0913
+        self,
+        spot_id: str,
+        *,
+        days: int,
+        interval_hours: int,
+        ratings_days: int | None = None,
+        conditional: bool = False,
+        metrics: SpotMetrics | None = None,
+    ) -> ForecastTimeline | None:
+        """
+        Fetch the ratings of a spot and refresh its expired conditions.
+
+        The ratings and every condition endpoint due are requested concurrently,
+        each within the hub concurrency limit. The ratings cover ratings_days
+        when given, the conditions always cover the whole horizon. Requests
+        made, retries included, are counted in metrics and the daily budget.
+        """
+        if metrics is None:
+            metrics = SpotMetrics()
+        requests = metrics.counters["requests"]
+        try:
+            ratings, *_ = await asyncio.gather(
+                self._async_limited(
+                    self.client.async_get_forecast,
+                    spot_id,
+                    days=ratings_days or days,
+                    interval_hours=interval_hours,
+                    conditional=conditional,
+                    metrics=metrics,
+                ),
+                *(
+                    self._async_limited(
+                        self.client.async_get_condition,
+                        spot_id,
+                        endpoint,
+                        days=days,
+                        interval_hours=interval_hours,
+                        metrics=metrics,
+                    )
+                    for endpoint in self.client.due_conditions(
+                        spot_id, days=days, interval_hours=interval_hours
+                    )
+                ),
+            )
+        finally:
+            # Only requests that reached Surfline count against the budget, not
+            # results shared with an identical request
+            self.scheduler.record_requests(
+                time.time(), metrics.counters["requests"] - requests
+            )
+        return ratings
+
+    async def async_search_spots(self, query: str) -> list[dict[str, Any]]:
+        """Search spots by name within the concurrency limit of the refreshes."""
+        return await self._async_limited(self.client.async_search_spots, query)
+
+    def conditions(
+        self, spot_id: str, *, days: int, interval_hours: int
+    ) -> dict[str, ConditionSeries]:
+        """Return the latest condition series of a spot."""
+        return self.client.conditions(spot_id, days=days, interval_hours=interval_hours)
+
+    async def _async_limited[**P, T](
+        self,
+        request: Callable[P, Awaitable[T]],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Run one Surfline request within the concurrency limit."""
+        metrics = kwargs.get("metrics")
+        queued = time.perf_counter()
+        async with self._semaphore:
+            if metrics is not None:
+                metrics.observe("queue_ms", (time.perf_counter() - queued) * 1000)
+            return await request(*args, **kwargs)
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Arm the single hub timer at the earliest due spot."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+        if self._refreshing:
+            # The cycle in progress re-arms the timer once it recorded its spots
+            return
+        if (next_refresh := self.scheduler.next_refresh(time.time())) is None:
+            return
+        self._unsub_refresh = async_track_point_in_utc_time(
+            self.hass,
+            self._async_refresh_due,
+            dt_util.utc_from_timestamp(next_refresh),
+        )
+
+    async def _async_refresh_due(self, _now: datetime | None = None) -> None:
+        """Refresh every spot that is due, isolating failures per spot."""
+        self._unsub_refresh = None
+        if self._refreshing:
+            return
+        due = [
+            (entry_id, coordinator)
+            for entry_id in self.scheduler.due(time.time())
+            if (coordinator := self._coordinators.get(entry_id)) is not None
+        ]
+        # Spots stay due until record_refresh; no cycle may start them again
+        self._refreshing.update(entry_id for entry_id, _ in due)
+        try:
+            await self._async_refresh(due)
+        finally:
+            self._refreshing.clear()
+        self._async_schedule_refresh()
+
+    async def _async_refresh(
+        self, due: list[tuple[str, SurfForecastDataUpdateCoordinator]]
+    ) -> None:
+        """Refresh the given spots together and schedule their next refresh."""
+        LOGGER.debug(
+            "Refreshing %s of %s surf spots", len(due), len(self._coordinators)
+        )
+        # Requests each spot had made, to measure what its refresh costs
+        requests = [coordinator.metrics.counters["requests"] for _, coordinator in due]
+        results = await asyncio.gather(
+            *(coordinator.async_refresh() for _, coordinator in due),
+            return_exceptions=True,
+        )
+        for (entry_id, coordinator), result, before in zip(
+            due, results, requests, strict=True
+        ):
+            if isinstance(result, Exception):
+                LOGGER.warning(
+                    "Refreshing %s failed: %s", coordinator.config_entry.title, result
+                )
+            self.scheduler.record_refresh(
+                entry_id,
+                time.time(),
+                changed=coordinator.forecast_changed,
+                failed=isinstance(result, Exception)
+                or not coordinator.last_update_success,
+                next_qualifying=coordinator.next_qualifying_timestamp(),
+                requests=coordinator.metrics.counters["requests"] - before,
+            )
@@ -0,0 +1,140 @@
+"""Rolling performance metrics of a surf spot."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any
+
+# Samples kept per histogram, and the window of event rates in seconds
+HISTOGRAM_WINDOW = 256
+RATE_WINDOW = 3600
+
+# Histograms of a spot, in milliseconds unless the name says otherwise
+HISTOGRAMS = ("request_ms", "payload_bytes", "decode_ms", "queue_ms", "refresh_ms")
+# Counters of a spot. Responses are not_modified (304), unchanged (same body
+# digest) or changed (decoded), the first two being revalidation cache hits.
+# Coalesced requests were answered by an identical request in flight or just
+# made. Every entity listener update either writes the state or skips the write.
+COUNTERS = (
+    "requests",
+    "coalesced",
+    "retries",
+    "failures",
+    "not_modified",
+    "unchanged",
+    "changed",
+    "listener_updates",
+    "state_writes",
+    "skipped_writes",
+)
+
+
+class RollingHistogram:
+    """Summary statistics over the most recent samples of a measurement."""
+
+    __slots__ = ("_samples", "count")
+
+    def __init__(self, window: int = HISTOGRAM_WINDOW) -> None:
+        """Initialize an empty histogram."""
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Record a sample, dropping the oldest one once the window is full."""
+        self._samples.append(value)
+        self.count += 1
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent sample."""
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the samples in the window (nearest rank)."""
+        if not self._samples:
+            return None
+        return _nearest_rank(sorted(self._samples), percent)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the count and the statistics of the window."""
+        if not self._samples:
+            return {"count": self.count}
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "last": round(self._samples[-1], 3),
+            "min": round(ordered[0], 3),
+            "mean": round(sum(ordered) / len(ordered), 3),
+            "p50": round(_nearest_rank(ordered, 50), 3),
+            "p90": round(_nearest_rank(ordered, 90), 3),
+            "p99": round(_nearest_rank(ordered, 99), 3),
+            "max": round(ordered[-1], 3),
+        }
+
+
+class SpotMetrics:
+    """Histograms, counters and the state write rate of one spot."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.histograms = {name: RollingHistogram() for name in HISTOGRAMS}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._state_writes: deque[float] = deque()
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a sample of a histogram."""
+        self.histograms[name].add(value)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] += amount
+
+    def count_state_writes(self, amount: int) -> None:
+        """Count entity state writes and remember when they happened."""
+        self.counters["state_writes"] += amount
+        now = time.monotonic()
+        self._state_writes.extend([now] * amount)
+        self._expire(now)
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Return the share of responses served from revalidation, in percent."""
+        hits = self.counters["not_modified"] + self.counters["unchanged"]
+        total = hits + self.counters["changed"]
+        return round(100 * hits / total, 1) if total else None
+
+    @property
+    def write_ratio(self) -> float | None:
+        """Return the share of listener updates that wrote a state."""
+        updates = self.counters["listener_updates"]
+        return round(self.counters["state_writes"] / updates, 3) if updates else None
+
+    @property
+    def state_writes_last_hour(self) -> int:
+        """Return how many entity states were written in the last hour."""
+        self._expire(time.monotonic())
+        return len(self._state_writes)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every metric, for diagnostics."""
+        return {
+            "histograms": {
+                name: histogram.summary() for name, histogram in self.histograms.items()
+            },
+            "counters": dict(self.counters),
+            "cache_hit_rate": self.cache_hit_rate,
+            "write_ratio": self.write_ratio,
+            "state_writes_last_hour": self.state_writes_last_hour,
+        }
+
+    def _expire(self, now: float) -> None:
+        """Drop state writes older than the rate window."""
+        while self._state_writes and self._state_writes[0] <= now - RATE_WINDOW:
+            self._state_writes.popleft()
+
+
+def _nearest_rank(ordered: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    rank = max(round(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
@@ -0,0 +1,451 @@
+"""Parsed forecast models for surf_forecast."""
+
+from __future__ import annotations
+
+import copy
+import json
+import math
+import re
+from array import array
+from bisect import bisect_left
+from itertools import compress, groupby
+from typing import TYPE_CHECKING, Any
+
+from .const import SURFLINE_RATING_LEVELS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+# Condition values of one Surfline endpoint, keyed by slot start
+type ConditionSeries = dict[int, tuple[float, ...]]
+
+# Position of each rating key in SURFLINE_RATING_LEVELS, for O(1) comparisons
+RATING_INDEX = {key: index for index, key in enumerate(SURFLINE_RATING_LEVELS)}
+# Stored for slots whose rating key is missing or not a known level
+UNKNOWN_RATING = -1
+
+# Lean decoding of a raw ratings body: one match per slot, capturing only the
+# timestamp and the key of the rating object, the only object nested in a slot
+_SLOT_PATTERN = re.compile(
+    rb'"timestamp"\s*:\s*(-?\d+)[^{]*\{[^{}]*?"key"\s*:\s*"(\w+)"'
+)
+_SLOT_MARKER = b'"timestamp"'
+_LOCATION_PATTERN = re.compile(rb'"location"\s*:\s*(\{[^{}]*\})')
+_RATING_INDEX_BYTES = {key.encode(): index for key, index in RATING_INDEX.items()}
+
+
+def _surf_values(slot: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the surf height range of a wave slot."""
+    surf = slot.get("surf") or {}
+    return surf.get("min"), surf.get("max")
+
+
+def _wind_values(slot: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the wind speed, direction and gusts of a wind slot."""
+    return slot.get("speed"), slot.get("direction"), slot.get("gust")
+
+
+def _swell_values(slot: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the height, period and direction of the most energetic swell."""
+    swells = [swell for swell in slot.get("swells") or [] if swell.get("height")]
+    dominant = max(
+        swells,
+        key=lambda swell: swell["height"] ** 2 * (swell.get("period") or 0),
+        default={},
+    )
+    return dominant.get("height"), dominant.get("period"), dominant.get("direction")
+
+
+def _tide_values(slot: dict[str, Any]) -> tuple[Any, ...]:
+    """Return the height of a tide slot."""
+    return (slot.get("height"),)
+
+
+# Conditions fetched next to the ratings, per Surfline endpoint: the fields it
+# adds to every slot of the timeline, and how to read them from a slot
+CONDITION_FIELDS: dict[str, tuple[str, ...]] = {
+    "wave": ("surf_min", "surf_max"),
+    "wind": ("wind_speed", "wind_direction", "wind_gust"),
+    "swells": ("swell_height", "swell_period", "swell_direction"),
+    "tides": ("tide_height",),
+}
+# Fields holding compass directions in degrees, averaged as angles
+DIRECTION_FIELDS = frozenset({"wind_direction", "swell_direction"})
+_CONDITION_READERS: dict[str, Callable[[dict[str, Any]], tuple[Any, ...]]] = {
+    "wave": _surf_values,
+    "wind": _wind_values,
+    "swells": _swell_values,
+    "tides": _tide_values,
+}
+
+
+def parse_conditions(endpoint: str, raw: bytes) -> ConditionSeries:
+    """
+    Decode a Surfline conditions response into values keyed by slot start.
+
+    Missing values are NaN. Tide extremes falling between slots are dropped when
+    the series is aligned on the rating slots.
+    """
+    payload = json.loads(raw) or {}
+    read = _CONDITION_READERS[endpoint]
+    series: ConditionSeries = {}
+    for slot in (payload.get("data") or {}).get(endpoint) or []:
+        timestamp = slot.get("timestamp")
+        if timestamp is None:
+            continue
+        series[int(timestamp)] = tuple(
+            float(value) if isinstance(value, int | float) else math.nan
+            for value in read(slot)
+        )
+    return series
+
+
+# Per rating level, a bytes.translate table turning a signed rating byte into 1
+# when it is at or above the level and 0 otherwise (UNKNOWN_RATING is 0xFF)
+_AT_OR_ABOVE_MASKS = tuple(
+    bytes(int(value < 0x80 and value >= level) for value in range(256))  # noqa: PLR2004
+    for level in range(len(SURFLINE_RATING_LEVELS))
+)
+
+
+class ForecastTimeline:
+    """
+    Compact, array-backed forecast for a single spot.
+
+    Slots are kept as two parallel arrays sorted by timestamp: epoch seconds and
+    the index of the rating key in SURFLINE_RATING_LEVELS. A per-level threshold
+    index of qualifying slot positions is built alongside them, so "first slot
+    at or above X" is a single bisection once the position of "now" is known.
+
+    Wave, wind, swell and tide conditions are aligned on the same slots, one
+    float array per field in CONDITION_FIELDS, NaN where a value is unknown.
+    """
+
+    __slots__ = ("at_or_above", "conditions", "location", "ratings", "timestamps")
+
+    def __init__(
+        self,
+        timestamps: array[int],
+        ratings: array[int],
+        location: dict[str, Any] | None = None,
+        conditions: dict[str, array[float]] | None = None,
+    ) -> None:
+        """Initialize the timeline from already sorted parallel arrays."""
+        self.timestamps = timestamps
+        self.ratings = ratings
+        self.location = location
+        self.conditions = conditions or {}
+        self.at_or_above = _build_threshold_index(ratings)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any] | None) -> ForecastTimeline:
+        """Build a timeline from a Surfline ratings response."""
+        payload = payload or {}
+        slots = (payload.get("data") or {}).get("rating") or []
+        pairs = []
+        for slot in slots:
+            timestamp = slot.get("timestamp")
+            if timestamp is None:
+                continue
+            key = (slot.get("rating") or {}).get("key")
+            pairs.append((int(timestamp), RATING_INDEX.get(key, UNKNOWN_RATING)))
+        pairs.sort()
+        return cls(
+            array("q", [timestamp for timestamp, _ in pairs]),
+            array("b", [rating for _, rating in pairs]),
+            (payload.get("associated") or {}).get("location"),
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> ForecastTimeline:
+        """
+        Build a timeline straight from a raw Surfline ratings response body.
+
+        Only the timestamp and rating key of each slot, and the location, are
+        extracted, without building the object graph of the whole response.
+        Bodies with an unexpected layout fall back to a full JSON decode, and
+        so do bodies whose brackets do not balance, which a body truncated
+        between two slots would otherwise pass for a shorter forecast; the full
+        decode then raises.
+        """
+        slots = _SLOT_PATTERN.findall(raw)
+        if (
+            len(slots) != raw.count(_SLOT_MARKER)
+            or raw.count(b"{") != raw.count(b"}")
+            or raw.count(b"[") != raw.count(b"]")
+        ):
+            return cls.from_payload(json.loads(raw))
+        timestamps = array("q", [int(timestamp) for timestamp, _ in slots])
+        ratings = array(
+            "b", [_RATING_INDEX_BYTES.get(key, UNKNOWN_RATING) for _, key in slots]
+        )
+        if any(map(int.__gt__, timestamps, timestamps[1:])):
+            pairs = sorted(zip(timestamps, ratings, strict=True))
+            timestamps = array("q", [timestamp for timestamp, _ in pairs])
+            ratings = array("b", [rating for _, rating in pairs])
+        location = _LOCATION_PATTERN.search(raw)
+        return cls(timestamps, ratings, json.loads(location[1]) if location else None)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ForecastTimeline:
+        """Restore a timeline serialized with as_dict."""
+        return cls(
+            array("q", data["timestamps"]),
+            array("b", data["ratings"]),
+            data.get("location"),
+            {
+                field: array(
+                    "d", [math.nan if value is None else value for value in values]
+                )
+                for field, values in (data.get("conditions") or {}).items()
+            },
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation of the timeline."""
+        return {
+            "timestamps": self.timestamps.tolist(),
+            "ratings": self.ratings.tolist(),
+            "location": self.location,
+            "conditions": {
+                field: [None if math.isnan(value) else value for value in values]
+                for field, values in self.conditions.items()
+            },
+        }
+
+    def with_conditions(
+        self, conditions: dict[str, ConditionSeries]
+    ) -> ForecastTimeline:
+        """
+        Return the timeline with conditions aligned on its slots.
+
+        Every endpoint series is looked up by slot start; slots it does not
+        cover get NaN. The rating arrays and threshold index are shared.
+        """
+        aligned: dict[str, array[float]] = {}
+        for endpoint, series in conditions.items():
+            fields = CONDITION_FIELDS[endpoint]
+            missing = (math.nan,) * len(fields)
+            rows = [series.get(timestamp, missing) for timestamp in self.timestamps]
+            columns = zip(*rows, strict=True) if rows else ((),) * len(fields)
+            for field, column in zip(fields, columns, strict=True):
+                aligned[field] = array("d", column)
+        timeline = copy.copy(self)
+        timeline.conditions = aligned
+        return timeline
+
+    def condition(self, field: str, index: int) -> float | None:
+        """Return a condition value of a slot, or None if unknown."""
+        values = self.conditions.get(field)
+        if values is None or not 0 <= index < len(values):
+            return None
+        value = values[index]
+        return None if math.isnan(value) else value
+
+    def conditions_at(self, index: int) -> dict[str, float]:
+        """Return the known condition values of a slot."""
+        return {
+            field: value
+            for field in self.conditions
+            if (value := self.condition(field, index)) is not None
+        }
+
+    def merged(self, near: ForecastTimeline) -> ForecastTimeline:
+        """
+        Return the timeline with its first slots replaced by a fresher window.
+
+        Slots from the start of near to its last slot come from near; the slots
+        after it are kept from this timeline, and the ones before it dropped.
+        Conditions are not carried over: align them again on the result.
+        """
+        if not near:
+            return self
+        tail = self.index_at(near.timestamps[-1] + 1)
+        return ForecastTimeline(
+            near.timestamps + self.timestamps[tail:],
+            near.ratings + self.ratings[tail:],
+            near.location if near.location is not None else self.location,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether two timelines hold the same slots and location."""
+        if not isinstance(other, ForecastTimeline):
+            return NotImplemented
+        return (
+            self.timestamps == other.timestamps
+            and self.ratings == other.ratings
+            and self.location == other.location
+            # Compared as bytes, since NaN never equals itself
+            and _condition_bytes(self.conditions) == _condition_bytes(other.conditions)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __len__(self) -> int:
+        """Return the number of forecast slots."""
+        return len(self.timestamps)
+
+    def slot_seconds(self) -> int | None:
+        """Return the shortest step between two slots, None with fewer slots."""
+        if len(self.timestamps) < 2:  # noqa: PLR2004
+            return None
+        return min(map(int.__sub__, self.timestamps[1:], self.timestamps))
+
+    def index_at(self, timestamp: float) -> int:
+        """Return the index of the first slot starting at or after a timestamp."""
+        return bisect_left(self.timestamps, timestamp)
+
+    def index_range(self, start: float, end: float) -> tuple[int, int]:
+        """Return the slice bounds of the slots starting in [start, end)."""
+        return self.index_at(start), self.index_at(end)
+
+    def rating_key(self, index: int) -> str | None:
+        """Return the rating key of a slot, or None if unknown or out of range."""
+        if not 0 <= index < len(self.ratings):
+            return None
+        rating = self.ratings[index]
+        return SURFLINE_RATING_LEVELS[rating] if rating != UNKNOWN_RATING else None
+
+    def rating_key_at(self, timestamp: float) -> str | None:
+        """Return the rating key of the first slot at or after a timestamp."""
+        return self.rating_key(self.index_at(timestamp))
+
+    def slot_indexes(
+        self, start: float, end: float, min_index: int | None = None
+    ) -> Sequence[int]:
+        """
+        Return the indexes of the slots starting in [start, end).
+
+        With min_index, only the slots rated at or above it: the range is cut
+        out of the threshold index of that level by bisection.
+        """
+        low, high = self.index_range(start, end)
+        if min_index is None:
+            return range(low, high)
+        positions = self.at_or_above[min_index]
+        return positions[bisect_left(positions, low) : bisect_left(positions, high)]
+
+    def forecast(
+        self,
+        start: float,
+        end: float,
+        *,
+        min_index: int | None = None,
+        step: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return the slots starting in [start, end) with their conditions.
+
+        With min_index, only the slots rated at or above it are listed. With a
+        step in seconds longer than the slots, the slots are grouped in steps
+        from the first one: a step has the start of its first slot, the best
+        rating and the mean of every known condition among its slots.
+        """
+        indexes = self.slot_indexes(start, end, min_index)
+        if not step or len(indexes) < 2:  # noqa: PLR2004
+            return [self._slot(index) for index in indexes]
+        timestamps, origin = self.timestamps, self.timestamps[indexes[0]]
+        return [
+            self._step(list(group))
+            for _, group in groupby(
+                indexes, key=lambda index: (timestamps[index] - origin) // step
+            )
+        ]
+
+    def _slot(self, index: int) -> dict[str, Any]:
+        """Return a slot with its rating and known conditions."""
+        return {
+            "timestamp": self.timestamps[index],
+            "rating": {"key": self.rating_key(index)},
+            **self.conditions_at(index),
+        }
+
+    def _step(self, indexes: list[int]) -> dict[str, Any]:
+        """Return consecutive slots summarized as one."""
+        if len(indexes) == 1:
+            return self._slot(indexes[0])
+        best = max(indexes, key=self.ratings.__getitem__)
+        step: dict[str, Any] = {
+            "timestamp": self.timestamps[indexes[0]],
+            "rating": {"key": self.rating_key(best)},
+        }
+        for field, values in self.conditions.items():
+            known = [
+                value
+                for value in map(values.__getitem__, indexes)
+                if not math.isnan(value)
+            ]
+            if known:
+                step[field] = (
+                    _mean_direction(known)
+                    if field in DIRECTION_FIELDS
+                    else sum(known) / len(known)
+                )
+        return step
+
+    def best_index(self, start: float, end: float) -> int | None:
+        """
+        Return the first of the best rated slots starting in [start, end).
+
+        Levels are tried from the top, each a bisection of its threshold index,
+        so the range is never scanned.
+        """
+        low, high = self.index_range(start, end)
+        for positions in reversed(self.at_or_above):
+            found = bisect_left(positions, low)
+            if found < len(positions) and positions[found] < high:
+                return positions[found]
+        return None
+
+    def rating_mask(self, min_index: int) -> bytes:
+        """Return a byte per slot, 1 when its rating is >= min_index, else 0."""
+        return self.ratings.tobytes().translate(_AT_OR_ABOVE_MASKS[min_index])
+
+    def first_index_at_or_above(self, min_index: int, start: int = 0) -> int | None:
+        """Return the first slot index from start whose rating is >= min_index."""
+        positions = self.at_or_above[min_index]
+        found = bisect_left(positions, start)
+        return positions[found] if found < len(positions) else None
+
+    def first_timestamp_at_or_above(
+        self, min_index: int, timestamp: float
+    ) -> int | None:
+        """Return the first slot start at or after timestamp rated >= min_index."""
+        index = self.first_index_at_or_above(min_index, self.index_at(timestamp))
+        return self.timestamps[index] if index is not None else None
+
+    def iter_slots(self) -> Iterator[tuple[int, str | None]]:
+        """Yield (timestamp, rating key) pairs in chronological order."""
+        for index, timestamp in enumerate(self.timestamps):
+            yield timestamp, self.rating_key(index)
+
+
+def _mean_direction(degrees: list[float]) -> float:
+    """Return the circular mean of compass directions, in [0, 360) degrees."""
+    radians = [math.radians(value) for value in degrees]
+    mean = math.degrees(
+        math.atan2(sum(map(math.sin, radians)), sum(map(math.cos, radians)))
+    )
+    return round(mean, 6) % 360
+
+
+def _condition_bytes(conditions: dict[str, array[float]]) -> dict[str, bytes]:
+    """Return the raw bytes of every condition array."""
+    return {field: values.tobytes() for field, values in conditions.items()}
+
+
+def _build_threshold_index(ratings: array[int]) -> tuple[array[int], ...]:
+    """
+    Build, for every rating level, the sorted positions of the qualifying slots.
+
+    at_or_above[level] holds every i with ratings[i] >= level. Each level is a
+    byte translation of the ratings into a 0/1 mask fed to compress, so no
+    Python code runs per slot.
+    """
+    typecode = "H" if len(ratings) <= 0xFFFF else "I"  # noqa: PLR2004
+    raw = ratings.tobytes()
+    positions = range(len(ratings))
+    return tuple(
+        array(typecode, compress(positions, raw.translate(mask)))
+        for mask in _AT_OR_ABOVE_MASKS
+    )
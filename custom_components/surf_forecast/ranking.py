@@ -0,0 +1,59 @@
+"""Incremental ranking of surf spots by forecast score."""
+
+from __future__ import annotations
+
+import heapq
+
+# Stale heap entries tolerated per live score before the heap is rebuilt
+COMPACT_FACTOR = 2
+
+type Score = tuple[int, ...]
+
+
+class SpotRanking:
+    """
+    Keep the best scoring spot at hand while spots update one at a time.
+
+    Scores live in a max-heap with lazy deletion: an update pushes the new
+    score and leaves the previous entry behind, to be discarded once it reaches
+    the top. Updating a spot and reading the best one are O(log spots)
+    amortized; no update rescans the other spots.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty ranking."""
+        # Entries are the negated score and the key, so the best one is first
+        self._heap: list[tuple[Score, str]] = []
+        self._scores: dict[str, Score] = {}
+
+    def __len__(self) -> int:
+        """Return the number of ranked spots."""
+        return len(self._scores)
+
+    def update(self, key: str, score: Score | None) -> None:
+        """Set the score of a spot, or unrank it when score is None."""
+        if score is None:
+            self._scores.pop(key, None)
+        elif self._scores.get(key) != score:
+            self._scores[key] = score
+            heapq.heappush(self._heap, (_negated(score), key))
+        if len(self._heap) > COMPACT_FACTOR * len(self._scores) + 16:
+            self._heap = [(_negated(score), key) for key, score in self._scores.items()]
+            heapq.heapify(self._heap)
+
+    def best(self) -> tuple[str, Score] | None:
+        """Return the key and score of the best spot, ties going to the lower key."""
+        heap = self._heap
+        while heap:
+            negated, key = heap[0]
+            if (score := self._scores.get(key)) is not None and score == _negated(
+                negated
+            ):
+                return key, score
+            heapq.heappop(heap)
+        return None
+
+
+def _negated(score: Score) -> Score:
+    """Return the score with every component negated, to order a min-heap."""
+    return tuple(-value for value in score)
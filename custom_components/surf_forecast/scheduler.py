@@ -0,0 +1,164 @@
+"""Adaptive polling schedule for the surf spots refreshed by the hub."""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .const import (
+    BATCH_WINDOW,
+    DEFAULT_DAILY_REQUEST_BUDGET,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    NEAR_SURF_WINDOW,
+    UPDATE_INTERVAL,
+    UPDATE_JITTER,
+)
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+DAY = 86400
+
+
+@dataclass
+class _SpotSchedule:
+    """Polling state of a single spot."""
+
+    next_refresh: float
+    unchanged_streak: int = 0
+    # Surfline requests the last refresh made, assumed 1 until measured
+    requests: int = 1
+
+
+class AdaptivePollScheduler:
+    """
+    Decide when each spot is refreshed next.
+
+    The interval of a spot doubles with every identical payload up to a ceiling,
+    drops to a floor while a qualifying slot is close, is jittered to spread
+    spots apart and is stretched so all spots together stay within a daily
+    request budget. A refresh fetches the ratings and every condition due, so
+    each spot weighs on the budget by the requests its last refresh made.
+    Times are epoch seconds.
+    """
+
+    def __init__(
+        self,
+        base_interval: timedelta = UPDATE_INTERVAL,
+        min_interval: timedelta = MIN_UPDATE_INTERVAL,
+        max_interval: timedelta = MAX_UPDATE_INTERVAL,
+        daily_request_budget: int = DEFAULT_DAILY_REQUEST_BUDGET,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.base_interval = base_interval.total_seconds()
+        self.min_interval = min_interval.total_seconds()
+        self.max_interval = max_interval.total_seconds()
+        self.daily_request_budget = daily_request_budget
+        self._spots: dict[str, _SpotSchedule] = {}
+        self._requests: deque[float] = deque()
+
+    def add(self, key: str, now: float) -> None:
+        """Start scheduling a spot that has just been refreshed."""
+        self._spots[key] = _SpotSchedule(now + self._jitter(self.base_interval))
+
+    def remove(self, key: str) -> None:
+        """Stop scheduling a spot."""
+        self._spots.pop(key, None)
+
+    def due(self, now: float) -> list[str]:
+        """Return the spots to refresh now, batching those due very soon."""
+        horizon = now + BATCH_WINDOW.total_seconds()
+        due = [key for key, spot in self._spots.items() if spot.next_refresh <= horizon]
+        if not self.daily_request_budget:
+            return due
+        remaining = self._remaining_budget(now)
+        if remaining >= sum(self._spots[key].requests for key in due):
+            return due
+        # Earliest due first while budget is left; the last one may overrun it
+        # by a refresh, so the timer never fires with nothing allowed
+        allowed = []
+        for key in sorted(due, key=lambda key: self._spots[key].next_refresh):
+            if remaining <= 0:
+                break
+            allowed.append(key)
+            remaining -= self._spots[key].requests
+        return allowed
+
+    def next_refresh(self, now: float) -> float | None:
+        """Return when the earliest spot is due, if any spot is scheduled."""
+        if not self._spots:
+            return None
+        next_refresh = min(spot.next_refresh for spot in self._spots.values())
+        if self.daily_request_budget and self._remaining_budget(now) <= 0:
+            # Budget exhausted: wait until the oldest request leaves the window
+            next_refresh = max(next_refresh, self._requests[0] + DAY)
+        return next_refresh
+
+    def record_refresh(  # noqa: PLR0913
+        self,
+        key: str,
+        now: float,
+        *,
+        changed: bool,
+        failed: bool,
+        next_qualifying: float | None,
+        requests: int | None = None,
+    ) -> None:
+        """
+        Schedule the next refresh of a spot from the outcome of this one.
+
+        requests is how many Surfline requests the refresh made, not counting
+        results shared with identical requests.
+        """
+        if (spot := self._spots.get(key)) is None:
+            return
+        if requests is not None:
+            spot.requests = max(requests, 1)
+        if failed:
+            interval = self.base_interval
+        elif changed:
+            spot.unchanged_streak = 0
+            interval = self.base_interval
+        else:
+            spot.unchanged_streak += 1
+            interval = min(
+                self.base_interval * 2**spot.unchanged_streak, self.max_interval
+            )
+        if (
+            next_qualifying is not None
+            and next_qualifying - now <= NEAR_SURF_WINDOW.total_seconds()
+        ):
+            interval = min(interval, self.min_interval)
+        if self.daily_request_budget:
+            # Fair share of the daily budget, weighted by the cost of each spot
+            total = sum(scheduled.requests for scheduled in self._spots.values())
+            interval = max(interval, DAY * total / self.daily_request_budget)
+        spot.next_refresh = now + self._jitter(interval)
+
+    def record_requests(self, now: float, count: int = 1) -> None:
+        """Count Surfline requests against the daily budget."""
+        self._requests.extend([now] * count)
+
+    def requests_last_day(self, now: float) -> int:
+        """Return how many requests were made in the last 24 hours."""
+        self._expire(now)
+        return len(self._requests)
+
+    def _remaining_budget(self, now: float) -> int:
+        """Return how many requests are still allowed in the rolling day."""
+        if not self.daily_request_budget:
+            return len(self._spots)
+        return max(self.daily_request_budget - self.requests_last_day(now), 0)
+
+    def _expire(self, now: float) -> None:
+        """Drop requests older than a day from the rolling window."""
+        while self._requests and self._requests[0] <= now - DAY:
+            self._requests.popleft()
+
+    @staticmethod
+    def _jitter(interval: float) -> float:
+        """Spread an interval randomly so spots drift apart."""
+        return interval * random.uniform(1 - UPDATE_JITTER, 1 + UPDATE_JITTER)  # noqa: S311
@@ -0,0 +1,126 @@
+"""Cached spot search shared by every config flow."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import SEARCH_QUERY_SIZE
+from .const import DOMAIN, LOGGER
+from .hub import async_get_hub
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+DATA_SPOT_SEARCH = f"{DOMAIN}_spot_search"
+# How long search results are reused, in seconds, and how many queries are kept
+SEARCH_CACHE_TTL = 600
+SEARCH_CACHE_SIZE = 64
+# Spot fields a narrowed query is matched against
+_SEARCHABLE_FIELDS = ("name", "city", "region", "country")
+
+
+def normalize_query(query: str) -> str:
+    """Return the cache key of a query: casefolded with whitespace collapsed."""
+    return " ".join(query.casefold().split())
+
+
+@callback
+def async_get_spot_search(hass: HomeAssistant) -> SpotSearch:
+    """Return the spot search of this Home Assistant instance."""
+    if (search := hass.data.get(DATA_SPOT_SEARCH)) is None:
+        search = hass.data[DATA_SPOT_SEARCH] = SpotSearch(hass)
+    return search
+
+
+class SpotSearch:
+    """
+    Search Surfline spots through a TTL and LRU bounded result cache.
+
+    Queries are cached by their normalized form. A query extending a cached one
+    whose results were complete (fewer hits than Surfline returns at most) is
+    answered by narrowing those results locally, so typing a longer name does
+    not go back to Surfline. Searches go through the hub, so they share its
+    client, circuit breakers and concurrency limit with the forecast refreshes,
+    and identical searches in flight share one request.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ttl: float = SEARCH_CACHE_TTL,
+        max_size: int = SEARCH_CACHE_SIZE,
+    ) -> None:
+        """Initialize the search."""
+        self.hass = hass
+        self.ttl = ttl
+        self.max_size = max_size
+        # Normalized query -> (expiry, spots), least recently used first
+        self._cache: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        self.stats = {"hits": 0, "prefix_hits": 0, "misses": 0}
+
+    async def async_search(self, query: str) -> list[dict[str, Any]]:
+        """Return the spots matching a query, from the cache when possible."""
+        key = normalize_query(query)
+        if (spots := self._cached(key)) is not None:
+            self.stats["hits"] += 1
+            return spots
+        if (spots := self._narrowed(key)) is not None:
+            self.stats["prefix_hits"] += 1
+            return spots
+        self.stats["misses"] += 1
+        # The hub is looked up on each search: setup replaces the one a flow made
+        spots = await async_get_hub(self.hass).async_search_spots(key)
+        self._store(key, spots)
+        return spots
+
+    def _cached(self, key: str) -> list[dict[str, Any]] | None:
+        """Return the unexpired results of a query and mark them recently used."""
+        if (entry := self._cache.get(key)) is None:
+            return None
+        expires, spots = entry
+        if expires <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return spots
+
+    def _narrowed(self, key: str) -> list[dict[str, Any]] | None:
+        """Answer a query from the complete results of its longest cached prefix."""
+        for end in range(len(key) - 1, 0, -1):
+            spots = self._cached(key[:end])
+            if spots is None:
+                continue
+            if len(spots) >= SEARCH_QUERY_SIZE:
+                # Surfline may have cut the results off, more spots could match
+                return None
+            terms = key.split()
+            narrowed = [spot for spot in spots if _matches(spot, terms)]
+            if not narrowed:
+                # A fuzzy match Surfline would find may be missing from the cache
+                return None
+            LOGGER.debug("Spot search %r answered from %r", key, key[:end])
+            return narrowed
+        return None
+
+    def _store(self, key: str, spots: list[dict[str, Any]]) -> None:
+        """Cache the results of a query, evicting the least recently used."""
+        self._cache[key] = (time.monotonic() + self.ttl, spots)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+
+def _matches(spot: dict[str, Any], terms: Iterable[str]) -> bool:
+    """Return whether every term appears in one of the searchable spot fields."""
+    text = " ".join(
+        str(value).casefold()
+        for field in _SEARCHABLE_FIELDS
+        if (value := spot.get(field))
+    )
+    return all(term in text for term in terms)
@@ -5,13 +5,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SURFLINE_RATING_LEVELS
+from .const import CONF_MIN_SURF_RATING, DOMAIN, SURFLINE_RATING_LEVELS
+from .entity import SurfForecastCoordinatorEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
     from .data import SurfForecastIntegrationConfigEntry
 
@@ -26,7 +27,7 @@ async def async_setup_entry(
     async_add_entities([SurflineMinRatingSelect(coordinator, entry)])
 
 
-class SurflineMinRatingSelect(CoordinatorEntity, SelectEntity):
+class SurflineMinRatingSelect(SurfForecastCoordinatorEntity, SelectEntity):
     """
     Select entity for minimum surf rating preference.
 
@@ -47,7 +48,7 @@ class SurflineMinRatingSelect(CoordinatorEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the currently selected minimum surf rating option."""
-        return self._attr_current_option
+        return self.coordinator.min_rating
 
     def __init__(self, coordinator: CoordinatorEntity, config_entry: Any) -> None:
         """
@@ -63,10 +64,6 @@ class SurflineMinRatingSelect(CoordinatorEntity, SelectEntity):
         self._attr_unique_id = f"{config_entry.entry_id}_min_rating"
         self._attr_name = "Minimum Surf Rating"
         self._attr_options = SURFLINE_RATING_LEVELS
-        # Restore from config_entry.options if present, else use default
-        self._attr_current_option = config_entry.options.get(
-            "min_surf_rating", SURFLINE_RATING_LEVELS[0]
-        )
         self._attr_device_info = {
             "identifiers": {(DOMAIN, config_entry.entry_id)},
             "name": config_entry.title,
@@ -88,11 +85,11 @@ class SurflineMinRatingSelect(CoordinatorEntity, SelectEntity):
 
         """
         if option in SURFLINE_RATING_LEVELS:
-            self._attr_current_option = option
-            # Persist the selected option in config_entry.options
+            # Persist the selected option in config_entry.options, then notify
+            # the coordinator so this select and the dependent entities update
+            # directly. The update listener sees no further live change.
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
-                options={**self.config_entry.options, "min_surf_rating": option},
+                options={**self.config_entry.options, CONF_MIN_SURF_RATING: option},
             )
-            self.async_write_ha_state()
-            self.coordinator.async_update_listeners()
+            self.coordinator.async_apply_live_options()
@@ -2,21 +2,129 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import math
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import slugify
-
-from .const import DOMAIN, SURFLINE_RATING_KEY_TO_ICON, SURFLINE_RATING_LEVELS
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+
+from .const import (
+    CONF_FORECAST_ATTRIBUTES,
+    CONF_FORECAST_HOURS,
+    DEFAULT_FORECAST_ATTRIBUTES,
+    DEFAULT_FORECAST_HOURS,
+    DOMAIN,
+    FORECAST_ATTRIBUTES_COMPACT,
+    FORECAST_ATTRIBUTES_FULL,
+    FORECAST_ATTRIBUTES_NONE,
+    SURFLINE_RATING_KEY_TO_ICON,
+    SURFLINE_RATING_LEVELS,
+)
+from .entity import SurfForecastCoordinatorEntity, update_property
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+    from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+    from .coordinator import SurfForecastDataUpdateCoordinator
     from .data import SurfForecastIntegrationConfigEntry
+    from .hub import SurfForecastHub
+    from .metrics import SpotMetrics
+    from .windows import SurfWindow
+
+# Only the metric sensors poll, reading the in-memory metrics of their spot
+SCAN_INTERVAL = timedelta(minutes=1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SurfForecastMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a performance metric sensor of a spot."""
+
+    value_fn: Callable[[SpotMetrics], float | None]
+
+
+METRIC_SENSORS: tuple[SurfForecastMetricSensorEntityDescription, ...] = (
+    SurfForecastMetricSensorEntityDescription(
+        key="request_latency",
+        name="Request latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda metrics: metrics.histograms["request_ms"].percentile(90),
+    ),
+    SurfForecastMetricSensorEntityDescription(
+        key="decode_time",
+        name="Decode time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.histograms["decode_ms"].percentile(90),
+    ),
+    SurfForecastMetricSensorEntityDescription(
+        key="payload_size",
+        name="Payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.histograms["payload_bytes"].last,
+    ),
+    SurfForecastMetricSensorEntityDescription(
+        key="cache_hit_rate",
+        name="Cache hit rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.cache_hit_rate,
+    ),
+    SurfForecastMetricSensorEntityDescription(
+        key="retries",
+        name="Request retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.counters["retries"],
+    ),
+    SurfForecastMetricSensorEntityDescription(
+        key="state_writes",
+        name="State writes per hour",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.state_writes_last_hour,
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,  # noqa: ARG001
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the best spot sensors shared by every configured spot."""
+    if discovery_info is None:
+        return
+    hub: SurfForecastHub = hass.data[DOMAIN]
+    async_add_entities(
+        [
+            SurfForecastBestSpotSensor(hub, ahead=False),
+            SurfForecastBestSpotSensor(hub, ahead=True),
+        ]
+    )
 
 
 async def async_setup_entry(
@@ -30,11 +138,17 @@ async def async_setup_entry(
         [
             SurflineRatingSensor(coordinator, entry),
             SurflineFirstMetConditionSensor(coordinator, entry),
+            SurflineSurfWindowSensor(coordinator, entry),
+            SurfForecastFetchedAtSensor(coordinator, entry),
+            *(
+                SurfForecastMetricSensor(coordinator, entry, description)
+                for description in METRIC_SENSORS
+            ),
         ]
     )
 
 
-class SurflineFirstMetConditionSensor(CoordinatorEntity, SensorEntity):
+class SurflineFirstMetConditionSensor(SurfForecastCoordinatorEntity, SensorEntity):
     """
     Sensor for the first forecasted date/time that meets or exceeds the selected.
 
@@ -47,34 +161,6 @@ class SurflineFirstMetConditionSensor(CoordinatorEntity, SensorEntity):
         """Keep sensor available during coordinator refreshes."""
         return self.coordinator.last_update_success or self.coordinator.data is not None
 
-    """Sensor for the first forecasted date/time that meets the selected min rating."""
-
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to select entity state changes and coordinator updates."""
-        await super().async_added_to_hass()
-
-        spot_slug = slugify(self.config_entry.title)
-        select_entity_id = f"select.{spot_slug}_minimum_surf_rating"
-        rating_entity_id = f"sensor.{spot_slug}_surf_rating"
-
-        async def _handle_related_change(event: object) -> None:  # noqa: ARG001
-            """Handle related entity state change by updating this sensor's state."""
-            self.async_write_ha_state()
-
-        # Listen for changes to the select entity
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, select_entity_id, _handle_related_change
-            )
-        )
-        # Listen for changes to the rating sensor entity
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, rating_entity_id, _handle_related_change
-            )
-        )
-        # Also listen for coordinator updates (already handled by CoordinatorEntity)
-
     """Sensor for the first forecasted date/time that meets or exceeds the selected
     minimum rating.
     """
@@ -102,40 +188,16 @@ class SurflineFirstMetConditionSensor(CoordinatorEntity, SensorEntity):
             "model": "Surf forecast",
         }
 
-    @property
+    @update_property
     def native_value(self) -> str | None:
         """Return the ISO date/time of the first forecast that meets min rating."""
-        hass = self.coordinator.hass
-        spot_slug = slugify(self.config_entry.title)
-        select_entity_id = f"select.{spot_slug}_minimum_surf_rating"
-        select_state = hass.states.get(select_entity_id)
-        min_rating = select_state.state if select_state else None
-        data = self.coordinator.data
-        if (
-            not min_rating
-            or not data
-            or "data" not in data
-            or "rating" not in data["data"]
-        ):
-            return None
-
-        if (
-            not min_rating
-            or min_rating == "unavailable"
-            or min_rating not in SURFLINE_RATING_LEVELS
-        ):
+        timestamp = self.coordinator.next_qualifying_timestamp()
+        if timestamp is None:
             return None
-        min_index = SURFLINE_RATING_LEVELS.index(min_rating)
-        for rating in data["data"]["rating"]:
-            key = rating["rating"].get("key")
-            if key and SURFLINE_RATING_LEVELS.index(key) >= min_index:
-                # Convert timestamp to ISO 8601 string
-                return (
-                    datetime.fromtimestamp(rating["timestamp"], tz=UTC)
-                    .isoformat()
-                    .replace("+00:00", "Z")
-                )
-        return None
+        # Convert timestamp to ISO 8601 string
+        return (
+            datetime.fromtimestamp(timestamp, tz=UTC).isoformat().replace("+00:00", "Z")
+        )
 
     @property
     def icon(self) -> str:
@@ -143,7 +205,59 @@ class SurflineFirstMetConditionSensor(CoordinatorEntity, SensorEntity):
         return "mdi:calendar"
 
 
-class SurflineRatingSensor(CoordinatorEntity, SensorEntity):
+class SurflineSurfWindowSensor(SurfForecastCoordinatorEntity, SensorEntity):
+    """
+    Sensor for the start of the next surf window.
+
+    A surf window is a run of consecutive slots at or above the minimum rating,
+    lasting at least the configured number of hours, optionally in daylight.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "next_surf_window"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator: CoordinatorEntity, config_entry: Any) -> None:
+        """Initialize the surf window sensor."""
+        super().__init__(coordinator)
+        self.config_entry = config_entry
+        self._attr_unique_id = f"{config_entry.entry_id}_next_surf_window"
+        self._attr_name = "Next surf window"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.title,
+            "manufacturer": "victorigualada",
+            "model": "Surf forecast",
+        }
+
+    @property
+    def available(self) -> bool:
+        """Keep sensor available during coordinator refreshes."""
+        return self.coordinator.last_update_success or self.coordinator.data is not None
+
+    @update_property
+    def _next_window(self) -> SurfWindow | None:
+        """Return the next surf window, searched once per update."""
+        windows = self.coordinator.find_windows(limit=1)
+        return windows[0] if windows else None
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the next surf window starts."""
+        window = self._next_window
+        return datetime.fromtimestamp(window.start, tz=UTC) if window else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Expose the end, length and best rating of the next surf window."""
+        if (window := self._next_window) is None:
+            return {"end": None, "hours": None, "peak_rating": None}
+        attributes = window.as_dict()
+        return {key: attributes[key] for key in ("end", "hours", "peak_rating")}
+
+
+class SurflineRatingSensor(SurfForecastCoordinatorEntity, SensorEntity):
     """Sensor for Surfline spot rating (current/next rating)."""
 
     @property
@@ -155,6 +269,11 @@ class SurflineRatingSensor(CoordinatorEntity, SensorEntity):
 
     _attr_has_entity_name = True
     _attr_translation_key = "surf_rating"
+    # Keep the bulky forecast, and the fetch time changing with every new
+    # forecast, out of the recorder database
+    _unrecorded_attributes = frozenset(
+        {"forecast", "forecast_timestamps", "forecast_ratings", "forecast_fetched_at"}
+    )
 
     def __init__(self, coordinator: CoordinatorEntity, config_entry: Any) -> None:
         """Initialize the Surfline rating sensor."""
@@ -169,43 +288,197 @@ class SurflineRatingSensor(CoordinatorEntity, SensorEntity):
             "model": "Surf forecast",
         }
 
-    @property
+    @update_property
     def native_value(self) -> str | None:
         """Return the current or next surf rating key (e.g., 'FAIR', 'GOOD')."""
-        data = self.coordinator.data
-        if not data or "data" not in data or "rating" not in data["data"]:
+        timeline = self.coordinator.data
+        if not timeline:
             return None
-        now = datetime.now(UTC).timestamp()
-        for rating in data["data"]["rating"]:
-            if rating["timestamp"] >= now:
-                return rating["rating"].get("key")
-        return None
+        return timeline.rating_key_at(datetime.now(UTC).timestamp())
 
-    @property
+    @update_property
     def icon(self) -> str | None:
         """Return an icon based on the current/next rating key."""
-        data = self.coordinator.data
-        if not data or "data" not in data or "rating" not in data["data"]:
+        timeline = self.coordinator.data
+        if not timeline:
             return None
-        now = datetime.now(UTC).timestamp()
-        for rating in data["data"]["rating"]:
-            if rating["timestamp"] >= now:
-                return SURFLINE_RATING_KEY_TO_ICON.get(
-                    rating["rating"].get("key"), "mdi:surfing"
-                )
-        return None
+        index = timeline.index_at(datetime.now(UTC).timestamp())
+        if index >= len(timeline):
+            return None
+        return SURFLINE_RATING_KEY_TO_ICON.get(
+            timeline.rating_key(index), "mdi:surfing"
+        )
 
-    @property
+    @update_property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Expose all forecasted ratings, location, spot_id, and href as attributes."""
-        data = self.coordinator.data
-        return {
+        """Expose location, spot_id, href and the forecast in the configured mode."""
+        timeline = self.coordinator.data
+        attributes: dict[str, Any] = {
             "spot_id": self.config_entry.data.get("spot_id"),
-            "location": (data.get("associated", {}).get("location") if data else None),
+            "location": timeline.location if timeline else None,
             "href": self.config_entry.data.get("href"),
-            "forecast": (
-                data["data"]["rating"]
-                if data and "data" in data and "rating" in data["data"]
-                else []
+            "forecast_fetched_at": (
+                fetched_at.isoformat()
+                if (fetched_at := self.coordinator.forecast_fetched_at)
+                else None
             ),
         }
+        options = self.config_entry.options
+        mode = options.get(CONF_FORECAST_ATTRIBUTES, DEFAULT_FORECAST_ATTRIBUTES)
+        if mode == FORECAST_ATTRIBUTES_NONE or not timeline:
+            return attributes
+        if mode == FORECAST_ATTRIBUTES_FULL:
+            attributes["forecast"] = timeline.forecast(-math.inf, math.inf)
+            return attributes
+        now = datetime.now(UTC).timestamp()
+        if mode == FORECAST_ATTRIBUTES_COMPACT:
+            start = timeline.index_at(now)
+            # Ratings are indexes into SURFLINE_RATING_LEVELS, -1 when unknown
+            attributes["forecast_timestamps"] = timeline.timestamps[start:].tolist()
+            attributes["forecast_ratings"] = timeline.ratings[start:].tolist()
+            return attributes
+        hours = options.get(CONF_FORECAST_HOURS, DEFAULT_FORECAST_HOURS)
+        attributes["forecast"] = timeline.forecast(now, now + hours * 3600)
+        return attributes
+
+
+class SurfForecastBestSpotSensor(SensorEntity):
+    """
+    Sensor for the best rated of all configured spots, now or in the next hours.
+
+    The hub keeps the spots ranked as each one updates; this sensor only reads
+    the top of the ranking and writes its state when the best spot changed.
+    """
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:trophy"
+
+    def __init__(self, hub: SurfForecastHub, *, ahead: bool) -> None:
+        """Initialize the best spot sensor."""
+        self.hub = hub
+        self.ahead = ahead
+        self.ranking = hub.best_next if ahead else hub.best_now
+        key = "best_spot_next" if ahead else "best_spot_now"
+        self._attr_unique_id = f"{DOMAIN}_{key}"
+        self._attr_translation_key = key
+        self._attr_name = (
+            f"Best surf spot next {hub.best_spot_hours} hours"
+            if ahead
+            else "Best surf spot now"
+        )
+        self._last_written: dict[str, Any] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the ranking of the hub."""
+        self.async_on_remove(
+            self.hub.async_add_ranking_listener(self._async_ranking_updated)
+        )
+
+    @callback
+    def _async_ranking_updated(self) -> None:
+        """Write the state when the best spot or its score changed."""
+        written = {"state": self.native_value, **self.extra_state_attributes}
+        if written == self._last_written:
+            return
+        self._last_written = written
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the name of the best spot."""
+        best = self.ranking.best()
+        if best is None or (coordinator := self.hub.coordinator(best[0])) is None:
+            return None
+        return coordinator.config_entry.title
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Expose the config entry, rating and, ahead, the time of the best slot."""
+        best = self.ranking.best()
+        if best is None:
+            return {"config_entry_id": None, "rating": None}
+        entry_id, score = best
+        attributes: dict[str, Any] = {
+            "config_entry_id": entry_id,
+            "rating": SURFLINE_RATING_LEVELS[score[0]],
+        }
+        if self.ahead:
+            attributes["at"] = datetime.fromtimestamp(-score[1], tz=UTC).isoformat()
+        return attributes
+
+
+class SurfForecastFetchedAtSensor(SensorEntity):
+    """
+    Diagnostic sensor showing when the forecast of a spot was last fetched.
+
+    Written on every successful fetch, also when Surfline returned the same
+    forecast and the other entities of the spot are left as they were.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Forecast fetched at"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(
+        self, coordinator: SurfForecastDataUpdateCoordinator, config_entry: Any
+    ) -> None:
+        """Initialize the fetch time sensor."""
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{config_entry.entry_id}_forecast_fetched_at"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.title,
+            "manufacturer": "victorigualada",
+            "model": "Surf forecast",
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state on every fetch of the coordinator."""
+        self.async_on_remove(
+            self.coordinator.async_add_fetch_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when the forecast was last fetched from Surfline."""
+        return self.coordinator.forecast_fetched_at
+
+
+class SurfForecastMetricSensor(SensorEntity):
+    """
+    Diagnostic sensor exposing one performance metric of a spot.
+
+    Disabled by default. Latencies are the 90th percentile of the recent
+    requests, so a slow spot stands out without enabling debug logging.
+    """
+
+    entity_description: SurfForecastMetricSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        coordinator: SurfForecastDataUpdateCoordinator,
+        config_entry: Any,
+        description: SurfForecastMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the metric sensor."""
+        self.entity_description = description
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.title,
+            "manufacturer": "victorigualada",
+            "model": "Surf forecast",
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the metric."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
@@ -0,0 +1,218 @@
+"""Services for surf_forecast."""
+
+from __future__ import annotations
+
+import math
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MAX_FORECAST_DAYS, SURFLINE_RATING_LEVELS
+from .models import RATING_INDEX
+
+if TYPE_CHECKING:
+    from .data import SurfForecastIntegrationConfigEntry
+
+SERVICE_FIND_SURF_WINDOWS = "find_surf_windows"
+SERVICE_GET_FORECAST = "get_forecast"
+SERVICE_GET_FORECAST_HISTORY = "get_forecast_history"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MIN_RATING = "min_rating"
+ATTR_MIN_HOURS = "min_hours"
+ATTR_DAYLIGHT = "daylight"
+ATTR_DAYS = "days"
+ATTR_LIMIT = "limit"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+ATTR_TIME = "time"
+
+# Spots default to every loaded spot, criteria to the options of each spot
+FIND_SURF_WINDOWS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MIN_RATING): vol.In(SURFLINE_RATING_LEVELS),
+        vol.Optional(ATTR_MIN_HOURS): vol.All(
+            vol.Coerce(float), vol.Range(min=0.5, max=48)
+        ),
+        vol.Optional(ATTR_DAYLIGHT): cv.boolean,
+        vol.Optional(ATTR_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_FORECAST_DAYS)
+        ),
+        vol.Optional(ATTR_LIMIT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+# The range defaults to the rest of the forecast, the resolution to its slots
+GET_FORECAST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_MIN_RATING): vol.In(SURFLINE_RATING_LEVELS),
+        vol.Optional(ATTR_RESOLUTION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=24)
+        ),
+    }
+)
+
+# Every rating the archive holds for the slot covering the time
+GET_FORECAST_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_TIME): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_find_surf_windows(call: ServiceCall) -> ServiceResponse:
+        """Return the upcoming surf windows of the requested spots."""
+        now = time.time()
+        days = call.data.get(ATTR_DAYS)
+        response = {}
+        for entry in _loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            windows = entry.runtime_data.coordinator.find_windows(
+                min_rating=call.data.get(ATTR_MIN_RATING),
+                min_hours=call.data.get(ATTR_MIN_HOURS),
+                daylight=call.data.get(ATTR_DAYLIGHT),
+                start=now,
+                end=now + days * 86400 if days else None,
+                limit=call.data[ATTR_LIMIT],
+            )
+            response[entry.entry_id] = {
+                "spot": entry.title,
+                "windows": [window.as_dict() for window in windows],
+            }
+        return response
+
+    async def async_get_forecast(call: ServiceCall) -> ServiceResponse:
+        """Return a slice of the stored forecast of the requested spots."""
+        start = (
+            dt_util.as_utc(call.data[ATTR_START]).timestamp()
+            if ATTR_START in call.data
+            else time.time()
+        )
+        end = (
+            dt_util.as_utc(call.data[ATTR_END]).timestamp()
+            if ATTR_END in call.data
+            else math.inf
+        )
+        if end <= start:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="invalid_range"
+            )
+        min_rating = call.data.get(ATTR_MIN_RATING)
+        resolution = call.data.get(ATTR_RESOLUTION)
+        response = {}
+        for entry in _loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            timeline = entry.runtime_data.coordinator.data
+            response[entry.entry_id] = {
+                "spot": entry.title,
+                "location": timeline.location if timeline else None,
+                "forecast": (
+                    timeline.forecast(
+                        start,
+                        end,
+                        min_index=RATING_INDEX[min_rating] if min_rating else None,
+                        step=resolution * 3600 if resolution else None,
+                    )
+                    if timeline
+                    else []
+                ),
+            }
+        return response
+
+    async def async_get_forecast_history(call: ServiceCall) -> ServiceResponse:
+        """Return how the forecast of the slot covering a time evolved."""
+        at = dt_util.as_utc(call.data[ATTR_TIME]).timestamp()
+        response = {}
+        for entry in _loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            archive = entry.runtime_data.coordinator.hub.archive
+            found = await archive.async_history(entry.data["spot_id"], at)
+            slot, history = found or (None, [])
+            response[entry.entry_id] = {
+                "spot": entry.title,
+                "slot": _isoformat(slot) if slot is not None else None,
+                "history": [
+                    {
+                        "issued_at": _isoformat(issued_at),
+                        "rating": SURFLINE_RATING_LEVELS[rating]
+                        if rating >= 0
+                        else None,
+                    }
+                    for issued_at, rating in history
+                ],
+            }
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_SURF_WINDOWS,
+        async_find_surf_windows,
+        schema=FIND_SURF_WINDOWS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST,
+        async_get_forecast,
+        schema=GET_FORECAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST_HISTORY,
+        async_get_forecast_history,
+        schema=GET_FORECAST_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _loaded_entries(
+    hass: HomeAssistant, entry_ids: list[str] | None
+) -> list[SurfForecastIntegrationConfigEntry]:
+    """Return the loaded spots with the given ids, or all of them."""
+    if not entry_ids:
+        return hass.config_entries.async_loaded_entries(DOMAIN)
+    entries = []
+    for entry_id in entry_ids:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="spot_not_found",
+                translation_placeholders={"config_entry_id": entry_id},
+            )
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="spot_not_loaded",
+                translation_placeholders={"spot": entry.title},
+            )
+        entries.append(entry)
+    return entries
+
+
+def _isoformat(timestamp: int) -> str:
+    """Return an epoch timestamp as an ISO 8601 UTC date and time."""
+    return datetime.fromtimestamp(timestamp, tz=UTC).isoformat()
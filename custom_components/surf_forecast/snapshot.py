@@ -0,0 +1,102 @@
+"""Persistent snapshots of the last good forecast of every spot."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+from .models import ForecastTimeline
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+# Coalesce the writes of a whole refresh cycle into a single file save
+SAVE_DELAY = 30
+
+
+class SurfForecastSnapshotStore:
+    """Keep the last parsed forecast of each spot on disk, keyed by spot_id."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the snapshot store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots once."""
+        async with self._load_lock:
+            if self._snapshots is not None:
+                return
+            data = await self._store.async_load() or {}
+            self._snapshots = data.get("spots", {})
+
+    async def async_get(
+        self, spot_id: str, *, days: int, interval_hours: int
+    ) -> tuple[ForecastTimeline, datetime] | None:
+        """
+        Return the stored timeline of a spot and when it was fetched.
+
+        A snapshot fetched for another horizon or slot interval is discarded.
+        """
+        await self.async_load()
+        snapshot = (self._snapshots or {}).get(spot_id)
+        if snapshot is None:
+            return None
+        if (snapshot.get("days"), snapshot.get("interval_hours")) != (
+            days,
+            interval_hours,
+        ):
+            LOGGER.debug(
+                "Discarding forecast snapshot of another horizon or interval for %s",
+                spot_id,
+            )
+            return None
+        fetched_at = dt_util.parse_datetime(snapshot["fetched_at"])
+        try:
+            timeline = ForecastTimeline.from_dict(snapshot["forecast"])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            LOGGER.warning("Discarding unreadable forecast snapshot for %s", spot_id)
+            return None
+        if fetched_at is None:
+            return None
+        return timeline, fetched_at
+
+    @callback
+    def async_save(
+        self,
+        spot_id: str,
+        timeline: ForecastTimeline,
+        fetched_at: datetime,
+        *,
+        days: int,
+        interval_hours: int,
+    ) -> None:
+        """Record the latest good forecast of a spot and schedule a save."""
+        if self._snapshots is None:
+            self._snapshots = {}
+        self._snapshots[spot_id] = {
+            "fetched_at": fetched_at.isoformat(),
+            "days": days,
+            "interval_hours": interval_hours,
+            "forecast": timeline.as_dict(),
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, spot_id: str) -> None:
+        """Forget the snapshot of a removed spot."""
+        if self._snapshots and self._snapshots.pop(spot_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"spots": self._snapshots or {}}
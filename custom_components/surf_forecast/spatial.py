@@ -0,0 +1,200 @@
+"""Local spatial index of every surf spot the integration has seen."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+from array import array
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Iterable
+
+DATA_SPOT_INDEX = f"{DOMAIN}_spot_index"
+STORAGE_KEY = f"{DOMAIN}.spots"
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+EARTH_RADIUS_KM = 6371.0
+# Spot fields kept in the index, enough to create a config entry from it
+SPOT_FIELDS = (
+    "spot_id",
+    "name",
+    "city",
+    "region",
+    "country",
+    "latitude",
+    "longitude",
+    "href",
+)
+
+
+async def async_get_spot_index(hass: HomeAssistant) -> SpotIndex:
+    """Return the spot index of this Home Assistant instance, loaded from disk."""
+    if (index := hass.data.get(DATA_SPOT_INDEX)) is None:
+        index = hass.data[DATA_SPOT_INDEX] = SpotIndex(
+            Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        )
+    await index.async_load()
+    return index
+
+
+class SpotIndex:
+    """
+    Nearest spot lookups over a k-d tree of spot positions.
+
+    Positions are points on the unit sphere, so the straight-line distance used
+    by the tree orders spots like the great-circle distance, with no special
+    case at the poles or the antimeridian. The tree is implicit: spots are
+    reordered so the median of every subrange splits it on the next axis, and
+    is rebuilt lazily after spots were added. The spots themselves are
+    persisted, the tree is rebuilt from them on load.
+    """
+
+    def __init__(self, store: Store[dict[str, Any]] | None = None) -> None:
+        """Initialize an empty index."""
+        self._store = store
+        self._spots: dict[str, dict[str, Any]] = {}
+        self._ids: list[str] = []
+        self._points: array[float] = array("d")
+        self._dirty = False
+        self._loaded = store is None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the stored spots once."""
+        async with self._load_lock:
+            if self._loaded or self._store is None:
+                return
+            data = await self._store.async_load() or {}
+            self.add(data.get("spots", {}).values())
+            self._loaded = True
+
+    def __len__(self) -> int:
+        """Return the number of indexed spots."""
+        return len(self._spots)
+
+    @callback
+    def async_add(self, spots: Iterable[dict[str, Any]]) -> None:
+        """Index spots with a position and schedule a save if any was new."""
+        if self.add(spots) and self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def add(self, spots: Iterable[dict[str, Any]]) -> bool:
+        """Index spots with a position and return whether the index changed."""
+        changed = False
+        for spot in spots:
+            spot_id = spot.get("spot_id")
+            try:
+                latitude = float(spot["latitude"])
+                longitude = float(spot["longitude"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if spot_id is None or not (
+                math.isfinite(latitude) and math.isfinite(longitude)
+            ):
+                continue
+            entry = {field: spot.get(field) for field in SPOT_FIELDS}
+            entry["latitude"], entry["longitude"] = latitude, longitude
+            if self._spots.get(spot_id) != entry:
+                self._spots[spot_id] = entry
+                changed = True
+        self._dirty |= changed
+        return changed
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        count: int,
+        exclude: Container[str] = (),
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Return up to count (distance in km, spot) pairs, nearest first."""
+        if self._dirty:
+            self._build()
+        target = _to_point(latitude, longitude)
+        points = self._points
+        ids = self._ids
+        # Max-heap of the best candidates so far, as (-squared chord, position)
+        best: list[tuple[float, int]] = []
+
+        def visit(low: int, high: int, axis: int) -> None:
+            if low >= high:
+                return
+            middle = (low + high) // 2
+            offset = 3 * middle
+            dx = target[0] - points[offset]
+            dy = target[1] - points[offset + 1]
+            dz = target[2] - points[offset + 2]
+            squared = dx * dx + dy * dy + dz * dz
+            if ids[middle] not in exclude:
+                if len(best) < count:
+                    heapq.heappush(best, (-squared, middle))
+                elif squared < -best[0][0]:
+                    heapq.heapreplace(best, (-squared, middle))
+            split = (dx, dy, dz)[axis]
+            next_axis = (axis + 1) % 3
+            if split < 0:
+                visit(low, middle, next_axis)
+                if len(best) < count or split * split < -best[0][0]:
+                    visit(middle + 1, high, next_axis)
+            else:
+                visit(middle + 1, high, next_axis)
+                if len(best) < count or split * split < -best[0][0]:
+                    visit(low, middle, next_axis)
+
+        if count > 0:
+            visit(0, len(ids), 0)
+        return [
+            (_chord_to_km(math.sqrt(-squared)), self._spots[ids[position]])
+            for squared, position in sorted(best, reverse=True)
+        ]
+
+    def _build(self) -> None:
+        """Reorder the spots into an implicit k-d tree."""
+        entries = [
+            (spot_id, _to_point(spot["latitude"], spot["longitude"]))
+            for spot_id, spot in self._spots.items()
+        ]
+
+        def build(low: int, high: int, axis: int) -> None:
+            if high - low <= 1:
+                return
+            entries[low:high] = sorted(
+                entries[low:high], key=lambda entry: entry[1][axis]
+            )
+            middle = (low + high) // 2
+            next_axis = (axis + 1) % 3
+            build(low, middle, next_axis)
+            build(middle + 1, high, next_axis)
+
+        build(0, len(entries), 0)
+        self._ids = [spot_id for spot_id, _ in entries]
+        self._points = array("d", [value for _, point in entries for value in point])
+        self._dirty = False
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"spots": self._spots}
+
+
+def _to_point(latitude: float, longitude: float) -> tuple[float, float, float]:
+    """Return the position on the unit sphere of a latitude and longitude."""
+    phi = math.radians(latitude)
+    lam = math.radians(longitude)
+    return (
+        math.cos(phi) * math.cos(lam),
+        math.cos(phi) * math.sin(lam),
+        math.sin(phi),
+    )
+
+
+def _chord_to_km(chord: float) -> float:
+    """Return the great-circle distance of a chord of the unit sphere."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
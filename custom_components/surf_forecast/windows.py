@@ -0,0 +1,186 @@
+"""Contiguous surf windows found in a forecast timeline."""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .const import SURFLINE_RATING_LEVELS
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .models import ForecastTimeline
+
+DAY = 86400
+# Julian date of the Unix epoch and of J2000, for the sunrise equation
+_JULIAN_UNIX_EPOCH = 2440587.5
+_JULIAN_J2000 = 2451545.0
+# Sun altitude at sunrise and sunset, accounting for refraction and its disc
+_SUNRISE_ALTITUDE = math.radians(-0.833)
+_EARTH_TILT = math.radians(23.4397)
+
+
+@dataclass(frozen=True, slots=True)
+class SurfWindow:
+    """A run of consecutive slots all rated at or above a minimum."""
+
+    # Epoch seconds of the start of the first slot and the end of the last one
+    start: int
+    end: int
+    slots: int
+    # Best rating within the window, as an index into SURFLINE_RATING_LEVELS
+    peak: int
+
+    @property
+    def hours(self) -> float:
+        """Return the length of the window in hours."""
+        return (self.end - self.start) / 3600
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation of the window."""
+        return {
+            "start": datetime.fromtimestamp(self.start, tz=UTC).isoformat(),
+            "end": datetime.fromtimestamp(self.end, tz=UTC).isoformat(),
+            "hours": self.hours,
+            "peak_rating": SURFLINE_RATING_LEVELS[self.peak],
+        }
+
+
+def find_windows(  # noqa: PLR0913
+    timeline: ForecastTimeline,
+    min_index: int,
+    min_hours: float,
+    *,
+    start: float,
+    end: float,
+    slot_seconds: int,
+    daylight_at: tuple[float, float] | None = None,
+    limit: int | None = None,
+) -> list[SurfWindow]:
+    """
+    Return the windows of at least min_hours rated >= min_index in [start, end).
+
+    The ratings are translated into a 0/1 byte mask, ANDed with a daylight
+    mask when daylight_at gives a (latitude, longitude), and the windows are
+    the runs of at least the required number of 1 bytes, found by a regex scan.
+    No Python code runs per slot, only per window found. Runs are split where
+    consecutive slots are not slot_seconds apart, so a gap in the forecast
+    never joins two windows.
+    """
+    low, high = timeline.index_range(start, end)
+    if low >= high:
+        return []
+    mask = timeline.rating_mask(min_index)
+    if daylight_at is not None:
+        daylight = daylight_mask(timeline, slot_seconds, *daylight_at, span=(low, high))
+        mask = (int.from_bytes(mask) & int.from_bytes(daylight)).to_bytes(len(mask))
+    needed = max(math.ceil(min_hours * 3600 / slot_seconds), 1)
+    timestamps, ratings = timeline.timestamps, timeline.ratings
+    windows = []
+    for run in _run_pattern(needed).finditer(mask, low, high):
+        for first, last in _contiguous(timestamps, *run.span(), slot_seconds):
+            if last - first < needed:
+                continue
+            windows.append(
+                SurfWindow(
+                    start=timestamps[first],
+                    end=timestamps[last - 1] + slot_seconds,
+                    slots=last - first,
+                    peak=max(ratings[first:last]),
+                )
+            )
+            if limit is not None and len(windows) >= limit:
+                return windows
+    return windows
+
+
+def _contiguous(
+    timestamps: Sequence[int], first: int, last: int, slot_seconds: int
+) -> list[tuple[int, int]]:
+    """Split the slots from first up to last where they are not contiguous."""
+    steps = map(int.__sub__, timestamps[first + 1 : last], timestamps[first : last - 1])
+    if all(map(slot_seconds.__eq__, steps)):
+        return [(first, last)]
+    spans = []
+    for index in range(first + 1, last):
+        if timestamps[index] - timestamps[index - 1] != slot_seconds:
+            spans.append((first, index))
+            first = index
+    spans.append((first, last))
+    return spans
+
+
+def daylight_mask(
+    timeline: ForecastTimeline,
+    slot_seconds: int,
+    latitude: float,
+    longitude: float,
+    span: tuple[int, int] | None = None,
+) -> bytes:
+    """
+    Return a 0/1 byte per slot: whether it lies between sunrise and sunset.
+
+    With span, only the slots from span[0] up to span[1] are marked.
+    """
+    timestamps = timeline.timestamps
+    mask = bytearray(len(timestamps))
+    first, last = span or (0, len(timestamps))
+    if first >= last:
+        return bytes(mask)
+    latitude, longitude = round(latitude, 2), round(longitude, 2)
+    for day in range(timestamps[first] // DAY - 1, timestamps[last - 1] // DAY + 2):
+        if (daylight := _daylight(latitude, longitude, day)) is None:
+            continue
+        sunrise, sunset = daylight
+        # Slots starting after sunrise and over by sunset
+        low, high = timeline.index_range(sunrise, sunset - slot_seconds + 1)
+        mask[low:high] = b"\x01" * (high - low)
+    return bytes(mask)
+
+
+@lru_cache(maxsize=1024)
+def _daylight(latitude: float, longitude: float, day: int) -> tuple[int, int] | None:
+    """
+    Return the sunrise and sunset of a day at a place, in epoch seconds.
+
+    Uses the sunrise equation; day counts days since the Unix epoch. Under the
+    midnight sun the whole day is daylight, during the polar night there is none.
+    """
+    # Mean solar noon at the longitude, in days since J2000
+    noon = round(day + _JULIAN_UNIX_EPOCH - _JULIAN_J2000 + 0.0008) - longitude / 360
+    anomaly = math.radians((357.5291 + 0.98560028 * noon) % 360)
+    center = (
+        1.9148 * math.sin(anomaly)
+        + 0.02 * math.sin(2 * anomaly)
+        + 0.0003 * math.sin(3 * anomaly)
+    )
+    ecliptic = math.radians((math.degrees(anomaly) + center + 180 + 102.9372) % 360)
+    transit = (
+        _JULIAN_J2000
+        + noon
+        + 0.0053 * math.sin(anomaly)
+        - 0.0069 * math.sin(2 * ecliptic)
+    )
+    declination = math.asin(math.sin(ecliptic) * math.sin(_EARTH_TILT))
+    phi = math.radians(latitude)
+    cos_hour_angle = (
+        math.sin(_SUNRISE_ALTITUDE) - math.sin(phi) * math.sin(declination)
+    ) / (math.cos(phi) * math.cos(declination))
+    if cos_hour_angle > 1:
+        return None
+    half_day = 0.5 if cos_hour_angle < -1 else math.acos(cos_hour_angle) / (2 * math.pi)
+    return (
+        round((transit - half_day - _JULIAN_UNIX_EPOCH) * DAY),
+        round((transit + half_day - _JULIAN_UNIX_EPOCH) * DAY),
+    )
+
+
+@lru_cache(maxsize=64)
+def _run_pattern(length: int) -> re.Pattern[bytes]:
+    """Return a pattern matching runs of at least length qualifying slots."""
+    return re.compile(rb"\x01{%d,}" % length)
@@ -0,0 +1 @@
+"""Tests for the surf_forecast integration."""
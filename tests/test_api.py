@@ -0,0 +1,133 @@
+"""Tests for the Surfline API client."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from multidict import CIMultiDict
+
+from custom_components.surf_forecast.api import (
+    CircuitBreaker,
+    SurfForecastIntegrationApiClient,
+    SurfForecastIntegrationApiClientCircuitOpenError,
+    SurfForecastIntegrationApiClientError,
+)
+
+
+class _HangingSession:
+    """Session whose requests never get an answer."""
+
+    async def request(self, **_: Any) -> None:
+        """Wait forever."""
+        await asyncio.Event().wait()
+
+
+class _Response:
+    """Response with a fixed body, answering 304 when the ETag matches."""
+
+    def __init__(self, body: bytes, headers: dict[str, str], status: int) -> None:
+        """Initialize the response."""
+        self.body = body
+        self.headers = CIMultiDict(headers)
+        self.status = status
+
+    def raise_for_status(self) -> None:
+        """Accept every status."""
+
+    def release(self) -> None:
+        """Release nothing."""
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self.body
+
+
+_RATINGS_BODY = b'{"data":{"rating":[{"timestamp":0,"rating":{"key":"FAIR"}}]}}'
+
+
+class _ETagSession:
+    """Session serving ratings bodies under one ETag, the first body first."""
+
+    etag = '"v1"'
+
+    def __init__(self, *bodies: bytes) -> None:
+        """Initialize with the bodies of the successive 200 responses."""
+        self.bodies = list(bodies or [_RATINGS_BODY])
+        self.requests: list[dict[str, str] | None] = []
+
+    async def request(self, *, headers: dict[str, str] | None, **_: Any) -> _Response:
+        """Answer 304 to a request revalidating the current ETag."""
+        self.requests.append(headers)
+        if headers and headers.get("If-None-Match") == self.etag:
+            return _Response(b"", {}, 304)
+        body = self.bodies.pop(0) if len(self.bodies) > 1 else self.bodies[0]
+        return _Response(body, {"ETag": self.etag}, 200)
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    """Return a breaker whose open period is already over."""
+    breaker = CircuitBreaker()
+    breaker.record_failure(retry_after=0)
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_cancelled_probe_releases_the_circuit() -> None:
+    """A probe cancelled mid-request lets the next request probe the host."""
+
+    async def run() -> CircuitBreaker:
+        client = SurfForecastIntegrationApiClient(_HangingSession())  # type: ignore[arg-type]
+        breaker = client._breakers["services.surfline.com"] = _half_open_breaker()
+        probe = asyncio.create_task(client.async_get_forecast("spot"))
+        await asyncio.sleep(0.01)
+        assert breaker._probing
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return breaker
+
+    breaker = asyncio.run(run())
+    assert breaker.state == "half_open"
+    assert breaker.before_request()
+
+
+def test_only_one_probe_at_a_time() -> None:
+    """While a probe is in flight, other requests are rejected."""
+    breaker = _half_open_breaker()
+    assert breaker.before_request()
+    with pytest.raises(SurfForecastIntegrationApiClientCircuitOpenError):
+        breaker.before_request()
+    breaker.release_probe()
+    assert breaker.before_request()
+
+
+def test_first_response_sets_the_validators() -> None:
+    """The poll after an unconditional fetch already revalidates it."""
+
+    async def run() -> tuple[_ETagSession, object]:
+        session = _ETagSession()
+        client = SurfForecastIntegrationApiClient(session, reuse_window=0)  # type: ignore[arg-type]
+        assert await client.async_get_forecast("spot") is not None
+        return session, await client.async_get_forecast("spot", conditional=True)
+
+    session, result = asyncio.run(run())
+    assert result is None
+    assert session.requests[1] == {"If-None-Match": '"v1"'}
+
+
+def test_body_that_fails_to_decode_is_not_revalidated() -> None:
+    """After a broken 200, the next poll fetches the forecast in full again."""
+
+    async def run() -> tuple[_ETagSession, object]:
+        session = _ETagSession(b'{"data":{"rating":[{"timestamp"', _RATINGS_BODY)
+        client = SurfForecastIntegrationApiClient(session, reuse_window=0)  # type: ignore[arg-type]
+        with pytest.raises(SurfForecastIntegrationApiClientError):
+            await client.async_get_forecast("spot")
+        return session, await client.async_get_forecast("spot", conditional=True)
+
+    session, result = asyncio.run(run())
+    assert result is not None
+    assert len(result) == 1
+    assert not session.requests[1]
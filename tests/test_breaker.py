@@ -0,0 +1,153 @@
+"""Tests of retries, rate limits and the circuit breaker against the stand-in."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+
+from benchmarks.standin import FaultProfile, SurflineStandin
+from custom_components.surf_forecast import api
+from custom_components.surf_forecast.api import (
+    CircuitBreaker,
+    SurfForecastIntegrationApiClient,
+    SurfForecastIntegrationApiClientCircuitOpenError,
+    SurfForecastIntegrationApiClientCommunicationError,
+    SurfForecastIntegrationApiClientRateLimitError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+HOST = "127.0.0.1"
+RESET_TIMEOUT = 0.05
+
+
+@pytest.fixture(autouse=True)
+def _fast_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the backoff between attempts in the milliseconds."""
+    monkeypatch.setattr(api, "BACKOFF_BASE", 0.001)
+
+
+@asynccontextmanager
+async def _serve(
+    faults: FaultProfile,
+) -> AsyncIterator[tuple[SurflineStandin, SurfForecastIntegrationApiClient]]:
+    """Serve the stand-in with faults and return a client pointed at it."""
+    standin = SurflineStandin(spot_count=1, faults=faults)
+    runner = await standin.async_start(HOST)
+    _, port = runner.addresses[0][:2]
+    async with aiohttp.ClientSession() as session:
+        client = SurfForecastIntegrationApiClient(
+            session, base_url=f"http://{HOST}:{port}", reuse_window=0
+        )
+        # Open after 3 failures, for less time than a test takes
+        client._breakers[HOST] = CircuitBreaker(
+            failure_threshold=api.MAX_ATTEMPTS, reset_timeout=RESET_TIMEOUT
+        )
+        try:
+            yield standin, client
+        finally:
+            await runner.cleanup()
+
+
+def test_server_errors_open_the_circuit() -> None:
+    """Once the host failed every attempt, requests fail without reaching it."""
+
+    async def run() -> None:
+        async with _serve(FaultProfile(server_errors=1.0)) as (standin, client):
+            with pytest.raises(SurfForecastIntegrationApiClientCommunicationError):
+                await client.async_get_forecast("spot")
+            assert standin.stats["server_errors"] == api.MAX_ATTEMPTS
+            assert client._breakers[HOST].state == "open"
+            with pytest.raises(SurfForecastIntegrationApiClientCircuitOpenError):
+                await client.async_get_forecast("spot")
+            assert standin.stats["rating"] == api.MAX_ATTEMPTS
+            assert client.stats["retries"] == api.MAX_ATTEMPTS - 1
+
+    asyncio.run(run())
+
+
+def test_half_open_probe_recovers_the_circuit() -> None:
+    """A failed probe opens the circuit again, a successful one closes it."""
+
+    async def run() -> None:
+        async with _serve(FaultProfile(server_errors=1.0)) as (standin, client):
+            breaker = client._breakers[HOST]
+            with pytest.raises(SurfForecastIntegrationApiClientCommunicationError):
+                await client.async_get_forecast("spot")
+            await asyncio.sleep(2 * RESET_TIMEOUT)
+            assert breaker.state == "half_open"
+            # Only the probe reaches the host, which is still failing
+            with pytest.raises(SurfForecastIntegrationApiClientCircuitOpenError):
+                await client.async_get_forecast("spot")
+            assert standin.stats["rating"] == api.MAX_ATTEMPTS + 1
+            assert breaker.state == "open"
+            standin.faults = FaultProfile()
+            await asyncio.sleep(2 * RESET_TIMEOUT)
+            assert await client.async_get_forecast("spot")
+            assert breaker.state == "closed"
+            assert breaker.opened_count == 2  # noqa: PLR2004
+
+    asyncio.run(run())
+
+
+def test_rate_limited_requests_honour_retry_after() -> None:
+    """A short Retry-After is waited for and the request retried."""
+
+    async def run() -> None:
+        faults = FaultProfile(rate_limited=1.0, retry_after=0)
+        async with _serve(faults) as (standin, client):
+            with pytest.raises(SurfForecastIntegrationApiClientRateLimitError):
+                await client.async_get_forecast("spot")
+            assert standin.stats["rate_limited"] == api.MAX_ATTEMPTS
+            assert client.stats["rate_limited"] == api.MAX_ATTEMPTS
+            # Retry-After opened the circuit for no time at all
+            standin.faults = FaultProfile()
+            assert await client.async_get_forecast("spot")
+
+    asyncio.run(run())
+
+
+def test_long_retry_after_is_not_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A 429 asking to wait too long fails at once and keeps the circuit open."""
+    monkeypatch.setattr(api, "MAX_RETRY_AFTER", 0.5)
+
+    async def run() -> None:
+        faults = FaultProfile(rate_limited=1.0, retry_after=60)
+        async with _serve(faults) as (standin, client):
+            with pytest.raises(SurfForecastIntegrationApiClientRateLimitError):
+                await client.async_get_forecast("spot")
+            assert standin.stats["rate_limited"] == 1
+            assert client._breakers[HOST].state == "open"
+
+    asyncio.run(run())
+
+
+def test_search_is_tried_once() -> None:
+    """A failed search is reported at once instead of retried."""
+
+    async def run() -> None:
+        async with _serve(FaultProfile(server_errors=1.0)) as (standin, client):
+            with pytest.raises(SurfForecastIntegrationApiClientCommunicationError):
+                await client.async_search_spots("pipeline")
+            assert standin.stats["search"] == 1
+            assert client.stats["retries"] == 0
+
+    asyncio.run(run())
+
+
+def test_search_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A search slower than its timeout fails without waiting for Surfline."""
+    monkeypatch.setattr(api, "SEARCH_TIMEOUT", 0.05)
+
+    async def run() -> None:
+        async with _serve(FaultProfile(latency=0.5)) as (standin, client):
+            with pytest.raises(SurfForecastIntegrationApiClientCommunicationError):
+                await client.async_search_spots("pipeline")
+            assert standin.stats["search"] == 1
+
+    asyncio.run(run())
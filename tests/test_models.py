@@ -0,0 +1,55 @@
+"""Tests for the parsed forecast models."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.surf_forecast.models import ForecastTimeline
+
+HOUR = 3600
+
+
+def _ratings_body(slots: int) -> bytes:
+    """Return a ratings response body shaped like Surfline's."""
+    return json.dumps(
+        {
+            "associated": {"location": {"lon": -1.5, "lat": 43.5}},
+            "data": {
+                "rating": [
+                    {
+                        "timestamp": HOUR * index,
+                        "utcOffset": 2,
+                        "rating": {"key": "FAIR", "value": 2},
+                    }
+                    for index in range(slots)
+                ]
+            },
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+def test_lean_decode_matches_full_decode() -> None:
+    """The lean decoder builds the same timeline as a full JSON decode."""
+    raw = _ratings_body(3)
+    assert ForecastTimeline.from_bytes(raw) == ForecastTimeline.from_payload(
+        json.loads(raw)
+    )
+
+
+def test_body_truncated_between_slots_is_rejected() -> None:
+    """A body cut after a whole slot is not read as a shorter forecast."""
+    raw = _ratings_body(3)
+    cut = raw.index(b',{"timestamp":7200')
+    for truncated in (raw[:cut], raw[: cut + 1]):
+        with pytest.raises(json.JSONDecodeError):
+            ForecastTimeline.from_bytes(truncated)
+
+
+def test_slot_seconds_comes_from_the_slots() -> None:
+    """The slot length is the shortest step between two slots."""
+    timeline = ForecastTimeline.from_bytes(_ratings_body(3))
+    assert timeline.slot_seconds() == HOUR
+    assert ForecastTimeline.from_bytes(_ratings_body(1)).slot_seconds() is None
@@ -0,0 +1,36 @@
+"""Tests for the adaptive polling scheduler."""
+
+from __future__ import annotations
+
+from custom_components.surf_forecast.scheduler import DAY, AdaptivePollScheduler
+
+
+def test_fair_share_is_weighted_by_requests_per_refresh() -> None:
+    """Spots costing several requests per refresh are spaced to fit the budget."""
+    scheduler = AdaptivePollScheduler(daily_request_budget=120)
+    for key in ("a", "b"):
+        scheduler.add(key, 0)
+    # Twice, so both refreshes are scheduled knowing the cost of both spots
+    for key in ("a", "b", "a", "b"):
+        scheduler.record_refresh(
+            key, 0, changed=True, failed=False, next_qualifying=None, requests=5
+        )
+    # 2 spots * 5 requests fit each spot 12 refreshes a day, one every 2 hours
+    assert scheduler.next_refresh(0) >= 2 * 3600 * 0.9
+
+
+def test_due_spots_are_limited_by_their_expected_requests() -> None:
+    """Only as many spots as the remaining budget covers are refreshed."""
+    scheduler = AdaptivePollScheduler(daily_request_budget=10)
+    for key in ("a", "b", "c"):
+        scheduler.add(key, 0)
+        scheduler.record_refresh(
+            key, 0, changed=True, failed=False, next_qualifying=None, requests=4
+        )
+    now = 2 * DAY
+    scheduler.record_requests(now - 1, 2)
+    # 8 requests left cover two spots at 4 requests each
+    assert scheduler.due(now) == ["a", "b"]
+    scheduler.record_requests(now, 8)
+    assert scheduler.due(now) == []
+    assert scheduler.next_refresh(now) == now - 1 + DAY
@@ -0,0 +1,26 @@
+"""Tests for the surf window search."""
+
+from __future__ import annotations
+
+from array import array
+
+from custom_components.surf_forecast.models import RATING_INDEX, ForecastTimeline
+from custom_components.surf_forecast.windows import find_windows
+
+HOUR = 3600
+GOOD = RATING_INDEX["GOOD"]
+
+
+def test_gap_in_the_forecast_splits_a_window() -> None:
+    """Qualifying slots on both sides of a missing slot are separate windows."""
+    timestamps = [0, HOUR, 2 * HOUR, 4 * HOUR, 5 * HOUR]
+    timeline = ForecastTimeline(
+        array("q", timestamps), array("b", [GOOD] * len(timestamps))
+    )
+    windows = find_windows(timeline, GOOD, 2, start=0, end=6 * HOUR, slot_seconds=HOUR)
+    assert [(window.start, window.end) for window in windows] == [
+        (0, 3 * HOUR),
+        (4 * HOUR, 6 * HOUR),
+    ]
+    # Neither side is long enough for a 4 hour window
+    assert not find_windows(timeline, GOOD, 4, start=0, end=6 * HOUR, slot_seconds=HOUR)